@@ -0,0 +1,240 @@
+import os, sys, json, time, shutil, platform, argparse, subprocess, tempfile, tracemalloc, resource
+from pathlib import Path
+
+# 오프라인 벤치마크
+#
+# 합성 네이버 RSS + 로컬 가짜 OAuth/Blogger 서버로 세 스크립트를 실제 네트워크 없이 돌리고
+# 시나리오별 wall time / 최대 RSS / 쓴 파일 수 / 글당 API 호출 수를 JSON으로 낸다.
+#
+# python scripts/bench.py --sizes 100,1000,50000 --out bench.json
+# python scripts/bench.py --scenarios ingest --sizes 50000
+#
+# 시나리오: build, backfill, backfill-batch(--batch 50), post 는 같은 작업 디렉터리에서 두 번(cold → warm) 실행해
+# 캐시/장부/manifest 효과도 함께 본다. build-serial 은 BUILD_WORKERS=1 (렌더 프로세스 풀/쓰기 스레드 풀 없이) 비교용. ingest 는 feedparser vs 스트리밍 파서 비교.
+# summarize 는 긴 요약 HTML에서 태그 제거+자르기 (정규식 전체 처리 vs 한 번 훑기 전체 vs limit에서 중단).
+# startup 은 --help 와 할 일 없는(304) post/build 실행의 시작 시간과 불러온 무거운 모듈.
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+import synth_feed
+from fake_blogger import FakeBlogger, serve
+
+SCENARIOS = ("startup", "ingest", "summarize", "build", "build-serial", "backfill", "backfill-batch", "post")
+SUMMARY_WORDS = (2000, 8000)
+HEAVY_MODULES = ("requests", "feedparser", "dateutil", "sqlite3")
+STARTUP_RUNS = 5
+
+def blogger_calls(stats):
+    """(API 호출 수, HTTP 왕복 수). 배치 파트("batch:…")는 호출로만, 배치 요청("batch 200")은 왕복으로만 센다."""
+    api = {k: n for k, n in stats.items() if not k.startswith(("feed ", "img "))}
+    calls = sum(n for k, n in api.items() if not k.startswith("batch "))
+    trips = sum(n for k, n in api.items() if not k.startswith("batch:"))
+    return calls, trips
+
+def run_child(cmd, env, cwd):
+    """자식 프로세스를 돌리고 (exit code, wall, 최대 RSS MB, stdout)."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    out = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - t0
+    # ru_maxrss: Linux는 KB, macOS는 바이트
+    rss = usage.ru_maxrss / (2**20 if sys.platform == "darwin" else 1024)
+    return proc.returncode, wall, rss, out
+
+def child_metrics(out):
+    """자식이 종료 시 찍은 "[metrics] {...}" 줄 (없으면 None)."""
+    for line in reversed(out.splitlines()):
+        if line.startswith("[metrics] "):
+            return json.loads(line[len("[metrics] "):])
+    return None
+
+def count_written(root, since):
+    if not root.exists():
+        return 0
+    return sum(1 for p in root.rglob("*") if p.is_file() and p.stat().st_mtime_ns >= since)
+
+def script_env(base, size):
+    return dict(
+        os.environ,
+        PYTHONPATH=str(HERE),
+        RSS_URL=f"{base}/feed.xml",
+        GOOGLE_TOKEN_URL=f"{base}/token",
+        BLOGGER_API=f"{base}/blogger/v3",
+        GCP_CLIENT_ID="bench", GCP_CLIENT_SECRET="bench", GCP_REFRESH_TOKEN="bench",
+        BLOG_ID="1",
+        BASE_URL="https://bench.example",
+        MAX_POSTS=str(size),
+    )
+
+def bench_script(scenario, size, feed, workdir, fail_rate=0.0):
+    fake = FakeBlogger(feed, fail_rate)
+    server = serve(fake)
+    env = script_env(f"http://127.0.0.1:{server.server_port}", size)
+    if scenario == "build-serial":
+        env["BUILD_WORKERS"] = "1"
+    cmd = {
+        "build": [sys.executable, "-m", "nblog", "build"],
+        "build-serial": [sys.executable, "-m", "nblog", "build"],
+        "backfill": [sys.executable, "-m", "nblog", "backfill", "--rate", "0", "--workers", "8"],
+        "backfill-batch": [sys.executable, "-m", "nblog", "backfill", "--rate", "0", "--batch", "50"],
+        "post": [sys.executable, "-m", "nblog", "post"],
+    }[scenario]
+
+    results = []
+    try:
+        for phase in ("cold", "warm"):
+            before = dict(fake.stats)
+            started = time.time_ns()
+            code, wall, rss, out = run_child(cmd, env, workdir)
+            after = dict(fake.stats)
+            delta = {k: after.get(k, 0) - before.get(k, 0) for k in after if after.get(k, 0) != before.get(k, 0)}
+            calls, trips = blogger_calls(delta)
+            results.append({
+                "scenario": scenario, "phase": phase, "items": size, "exit_code": code,
+                "wall_s": round(wall, 3), "max_rss_mb": round(rss, 1),
+                "files_written": count_written(workdir / "dist", started),
+                "api_calls": calls, "api_calls_per_entry": round(calls / size, 3), "round_trips": trips,
+                "http": delta,
+                "metrics": child_metrics(out),
+            })
+            if code != 0:
+                results[-1]["tail"] = out[-2000:]
+    finally:
+        server.shutdown()
+    return results
+
+def imported_heavy(out):
+    """-X importtime 출력에서 HEAVY_MODULES 중 실제로 import 된 것."""
+    names = {line.rsplit("|", 1)[-1].strip() for line in out.splitlines() if line.startswith("import time:")}
+    return sorted(m for m in HEAVY_MODULES if m in names)
+
+def bench_startup(size, feed, workdir):
+    """python -m nblog 의 cold start: --help, 304 post, 304 build (각 STARTUP_RUNS회 중앙값)."""
+    fake = FakeBlogger(feed)
+    server = serve(fake)
+    env = script_env(f"http://127.0.0.1:{server.server_port}", size)
+    nblog = [sys.executable, "-X", "importtime", "-m", "nblog"]
+    results = []
+    try:
+        # 캐시/dist를 채워 두면 이후 post/build 는 304로 바로 끝난다
+        for cmd in ("build", "post"):
+            run_child(nblog[:1] + ["-m", "nblog", cmd], env, workdir)
+        for label, args in (("help", ["--help"]), ("post-304", ["post"]), ("build-304", ["build"])):
+            walls, heavy = [], []
+            for _ in range(STARTUP_RUNS):
+                code, wall, rss, out = run_child(nblog + args, env, workdir)
+                walls.append(wall)
+                heavy = imported_heavy(out)
+            results.append({"scenario": "startup", "phase": label, "items": size, "exit_code": code,
+                            "wall_ms": round(sorted(walls)[len(walls) // 2] * 1000, 1),
+                            "max_rss_mb": round(rss, 1), "heavy_imports": heavy})
+    finally:
+        server.shutdown()
+    return results
+
+def bench_summarize(size):
+    """요약 size개(각 수천 단어)를 400자로 줄이는 비용, 세 방식 비교."""
+    import re, html
+    from nblog.html_text import html_to_text
+    tag_re = re.compile(r"<[^>]+>")
+    def regex_strip(s, limit):
+        t = " ".join(html.unescape(tag_re.sub(" ", s)).split())
+        return t[:limit] + "…" if len(t) > limit else t
+    docs = synth_feed.summaries(size, words=SUMMARY_WORDS)
+    results = []
+    for label, fn in (("regex-full", regex_strip),
+                      ("parser-full", lambda s, limit: html_to_text(s)[:limit]),
+                      ("parser-early-stop", html_to_text)):
+        t0 = time.perf_counter()
+        for d in docs:
+            fn(d, 400)
+        wall = time.perf_counter() - t0
+        results.append({"scenario": "summarize", "phase": label, "items": size,
+                        "avg_doc_kb": round(sum(map(len, docs)) / size / 1024, 1),
+                        "wall_s": round(wall, 3), "us_per_item": round(wall / size * 1e6, 1)})
+    return results
+
+def ingest_child(path_name, feed):
+    """--_ingest 자식 모드: 한 경로만 측정해서 JSON 한 줄 출력."""
+    for k in ("GCP_CLIENT_ID", "GCP_CLIENT_SECRET", "GCP_REFRESH_TOKEN", "BLOG_ID"):
+        os.environ.setdefault(k, "bench")
+    from nblog import backfill as bb
+    args = argparse.Namespace(since=None, until=None, oldest_first=True, skip=0, max=100)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    selected = list(bb.select_candidates(bb.fetch_entries(feed, stream=(path_name == "stream")), args))
+    wall = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    print(json.dumps({"path": path_name, "selected": len(selected), "wall_s": round(wall, 3),
+                      "py_peak_mb": round(peak / 2**20, 1),
+                      "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}))
+
+def bench_ingest(size, feed):
+    results = []
+    for path_name in ("feedparser", "stream"):
+        code, wall, rss, out = run_child([sys.executable, __file__, "--_ingest", path_name, feed], os.environ, HERE)
+        r = json.loads(out.strip().splitlines()[-1]) if code == 0 else {"path": path_name, "exit_code": code, "tail": out[-2000:]}
+        r.update(scenario="ingest", items=size)
+        results.append(r)
+    return results
+
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def main():
+    p = argparse.ArgumentParser(description="Offline benchmark for nblog build / post / backfill")
+    p.add_argument("--sizes", default="100,1000", help="합성 피드 글 수 (쉼표 구분)")
+    p.add_argument("--scenarios", default=",".join(SCENARIOS), help="실행할 시나리오 (쉼표 구분)")
+    p.add_argument("--fail-rate", type=float, default=0.0, help="가짜 Blogger API가 섞어 보낼 429 비율")
+    p.add_argument("--out", help="결과 JSON 파일 경로 (없으면 stdout만)")
+    p.add_argument("--keep", action="store_true", help="작업 디렉터리를 지우지 않음")
+    p.add_argument("--_ingest", nargs=2, help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args._ingest:
+        ingest_child(*args._ingest)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    report = {
+        "meta": {"timestamp": int(time.time()), "git": git_rev(), "python": platform.python_version(),
+                 "platform": platform.platform(), "cpus": os.cpu_count(), "fail_rate": args.fail_rate},
+        "results": [],
+    }
+    tmp = Path(tempfile.mkdtemp(prefix="nblog-bench-"))
+    try:
+        for size in sizes:
+            feed = tmp / f"feed-{size}.xml"
+            synth_feed.write_feed(feed, size)
+            for scenario in scenarios:
+                print(f"[bench] {scenario} items={size}", file=sys.stderr, flush=True)
+                if scenario == "ingest":
+                    report["results"] += bench_ingest(size, str(feed))
+                    continue
+                if scenario == "summarize":
+                    report["results"] += bench_summarize(size)
+                    continue
+                workdir = tmp / f"{scenario}-{size}"
+                workdir.mkdir()
+                if scenario == "startup":
+                    report["results"] += bench_startup(size, str(feed), workdir)
+                else:
+                    report["results"] += bench_script(scenario, size, str(feed), workdir, args.fail_rate)
+    finally:
+        if not args.keep:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import json, re, html, email, random, hashlib, threading, argparse, urllib.parse
+from http import HTTPStatus
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 로컬 가짜 OAuth 토큰 + Blogger API + 피드 서버 (벤치마크/리허설용)
+#
+# python scripts/fake_blogger.py --port 8765 --feed feed.xml --fail-rate 0.1
+#
+#   POST /token                                  → access_token
+#   GET  /blogger/v3/blogs/{id}/posts/search?q=  → 마커/링크 정확 일치 검색
+#   GET  /blogger/v3/blogs/{id}/posts            → pageToken 페이지네이션 목록
+#   POST /blogger/v3/blogs/{id}/posts/           → 글 생성
+#   PATCH /blogger/v3/blogs/{id}/posts/{postId}  → 글 수정
+#   GET  /feed.xml                               → --feed 파일 (ETag/304 지원)
+#                                                  본문의 blogthumb.pstatic.net 이미지 주소는 이 서버의 /img/ 로 바꿔서
+#   GET  /img/{name}                             → 이름으로 만든 가짜 JPEG (Referer 없으면 403: 네이버 핫링크 차단 흉내)
+#   POST /batch/blogger/v3                       → multipart/mixed 배치 (파트마다 위 API 중 하나)
+#   GET  /_stats                                 → 엔드포인트·상태코드별 호출 수 (배치 파트는 "batch:posts.insert 200" 식)
+#
+# --fail-rate 만큼 Blogger 호출(배치면 파트별)에 429(Retry-After: 1)를 섞는다.
+
+MARKER_RE = re.compile(r"<!--\s*(source:nblog:[^\s]+)\s*-->")
+HREF_RE   = re.compile(r'href="([^"]+)"')
+IMAGE_HOST = b"https://blogthumb.pstatic.net/"
+PATH_RE   = re.compile(r"^/blogger/v3/blogs/[^/]+/posts(/search|/)?$")
+POST_RE   = re.compile(r"^/blogger/v3/blogs/[^/]+/posts/(\d+)$")
+
+class FakeBlogger:
+    def __init__(self, feed_path=None, fail_rate=0.0, seed=0):
+        self.feed_path = feed_path
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.posts = []          # [{id, url, title, content}]
+        self.index = {}          # 마커/링크 → post
+        self.stats = Counter()
+        self.lock = threading.Lock()
+
+    def create(self, body):
+        with self.lock:
+            pid = str(len(self.posts) + 1)
+            post = {"id": pid, "url": f"https://fake.blogspot.com/{pid}.html",
+                    "title": body.get("title"), "content": body.get("content") or ""}
+            self.posts.append(post)
+            for key in MARKER_RE.findall(post["content"]) + [html.unescape(h) for h in HREF_RE.findall(post["content"])]:
+                self.index[key] = post
+            return post
+
+    def update(self, pid, body):
+        with self.lock:
+            if not pid.isdigit() or not 0 < int(pid) <= len(self.posts):
+                return None
+            post = self.posts[int(pid) - 1]
+            post.update({k: body[k] for k in ("title", "content") if k in body})
+            for key in MARKER_RE.findall(post["content"]) + [html.unescape(h) for h in HREF_RE.findall(post["content"])]:
+                self.index[key] = post
+            return post
+
+    def search(self, q):
+        return self.index.get(q.strip('"'))
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 헤더와 본문을 한 번에 내보내야 keep-alive에서 Nagle/지연 ACK로 40ms씩 멈추지 않는다
+        wbufsize = 64 * 1024
+        disable_nagle_algorithm = True
+
+        def log_message(self, *a):
+            pass
+
+        def _send(self, code, obj=None, headers=None, raw=None):
+            body = raw if raw is not None else json.dumps(obj or {}).encode()
+            self.send_response(code)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _count(self, endpoint, code):
+            with fake.lock:
+                fake.stats[f"{endpoint} {code}"] += 1
+
+        def _throttle(self, endpoint):
+            if fake.fail_rate and fake.rng.random() < fake.fail_rate:
+                self._count(endpoint, 429)
+                return True
+            return False
+
+        def do_GET(self):
+            u = urllib.parse.urlsplit(self.path)
+            if u.path == "/_stats":
+                with fake.lock:
+                    return self._send(200, {"stats": dict(fake.stats), "posts": len(fake.posts)})
+            if u.path == "/feed.xml":
+                with open(fake.feed_path, "rb") as f:
+                    data = f.read()
+                data = data.replace(IMAGE_HOST, f"http://127.0.0.1:{self.server.server_port}/img/".encode())
+                etag = '"%s"' % hashlib.sha1(data).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    self._count("feed", 304)
+                    return self._send(304, raw=b"", headers={"ETag": etag})
+                self._count("feed", 200)
+                return self._send(200, raw=data, headers={"ETag": etag, "Content-Type": "application/rss+xml"})
+            if u.path.startswith("/img/"):
+                if not self.headers.get("Referer"):
+                    self._count("img", 403)
+                    return self._send(403)
+                self._count("img", 200)
+                # JPEG 시그니처 + 이름 해시를 늘린 내용 (~4KB)
+                data = b"\xff\xd8\xff\xe0" + hashlib.sha256(u.path.encode()).digest() * 128
+                return self._send(200, raw=data, headers={"Content-Type": "image/jpeg"})
+            self._send(*self._api("GET", self.path, b""))
+
+        def do_POST(self):
+            u = urllib.parse.urlsplit(self.path)
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if u.path == "/token":
+                self._count("token", 200)
+                return self._send(200, {"access_token": "fake-token", "expires_in": 3600})
+            if u.path == "/batch/blogger/v3":
+                return self._batch(raw)
+            self._send(*self._api("POST", self.path, raw))
+
+        def do_PATCH(self):
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self._send(*self._api("PATCH", self.path, raw))
+
+        def _api(self, method, path, raw, tag=""):
+            """Blogger 엔드포인트 1건 → (code, obj, headers). 단건 요청과 batch 파트(tag="batch:")가 같이 쓴다."""
+            u = urllib.parse.urlsplit(path)
+            qs = urllib.parse.parse_qs(u.query)
+            m = POST_RE.match(u.path)
+            if method == "PATCH" and m:
+                if self._throttle(tag + "posts.patch"):
+                    return 429, {"error": {"code": 429}}, {"Retry-After": "1"}
+                post = fake.update(m.group(1), json.loads(raw or b"{}"))
+                self._count(tag + "posts.patch", 200 if post else 404)
+                return (200, post, None) if post else (404, {"error": {"code": 404}}, None)
+            m = PATH_RE.match(u.path)
+            if not m or method not in ("GET", "POST"):
+                return 404, None, None
+            endpoint = "posts.insert" if method == "POST" else "posts.search" if m.group(1) == "/search" else "posts.list"
+            if self._throttle(tag + endpoint):
+                return 429, {"error": {"code": 429}}, {"Retry-After": "1"}
+            self._count(tag + endpoint, 200)
+            if endpoint == "posts.insert":
+                return 200, fake.create(json.loads(raw or b"{}")), None
+            if endpoint == "posts.search":
+                hit = fake.search((qs.get("q") or [""])[0])
+                return 200, {"items": [hit]} if hit else {}, None
+            start = int((qs.get("pageToken") or ["0"])[0])
+            size = int((qs.get("maxResults") or ["20"])[0])
+            with fake.lock:
+                page = fake.posts[start:start + size]
+                more = start + size < len(fake.posts)
+            js = {"items": page}
+            if more:
+                js["nextPageToken"] = str(start + size)
+            return 200, js, None
+
+        def _batch(self, raw):
+            """multipart/mixed 배치: 파트마다 _api를 돌려 같은 순서·Content-ID로 응답 (파트별로 429가 섞일 수 있다)."""
+            msg = email.message_from_bytes(b"Content-Type: " + self.headers.get("Content-Type", "").encode() + b"\r\n\r\n" + raw)
+            if not msg.is_multipart():
+                return self._send(400, {"error": {"code": 400, "message": "multipart/mixed body required"}})
+            self._count("batch", 200)
+            boundary = "batch_" + hashlib.sha1(raw).hexdigest()[:16]
+            out = []
+            for part in msg.get_payload():
+                req = part.get_payload(decode=True) or b""
+                head, _, body = req.partition(b"\r\n\r\n")
+                method, target = head.split(b"\r\n")[0].decode().split()[:2]
+                code, obj, headers = self._api(method, target, body, "batch:")
+                lines = [f"HTTP/1.1 {code} {HTTPStatus(code).phrase}", "Content-Type: application/json; charset=UTF-8"]
+                lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+                cid = (part.get("Content-ID") or "").strip("<>")
+                out.append(f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{cid}>\r\n\r\n"
+                           + "\r\n".join(lines) + "\r\n\r\n" + json.dumps(obj or {}) + "\r\n")
+            data = ("".join(out) + f"--{boundary}--\r\n").encode()
+            self._send(200, raw=data, headers={"Content-Type": f"multipart/mixed; boundary={boundary}"})
+
+    return Handler
+
+def serve(fake, host="127.0.0.1", port=0):
+    """백그라운드 스레드로 띄우고 서버 객체를 돌려준다 (server.server_port로 포트 확인)."""
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Local fake Blogger API for benchmarks")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--feed", help="/feed.xml 로 제공할 RSS 파일")
+    p.add_argument("--fail-rate", type=float, default=0.0, help="429 응답 비율")
+    args = p.parse_args()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(FakeBlogger(args.feed, args.fail_rate)))
+    print(f"fake blogger on http://127.0.0.1:{args.port}  (GOOGLE_TOKEN_URL=.../token BLOGGER_API=.../blogger/v3)", flush=True)
+    server.serve_forever()
@@ -0,0 +1,8 @@
+# 네이버 블로그 RSS → 정적 미러 사이트 / Blogger 발행 도구
+#
+#   python -m nblog build      # dist/ 에 사이트 생성
+#   python -m nblog post       # 최신 글을 Blogger에 발행 (cron)
+#   python -m nblog backfill   # 예전 글 일괄 발행
+#   python -m nblog watch      # 피드가 바뀔 때마다 build + post (상주)
+#
+# 하위 모듈은 명령이 정해진 뒤에 import 한다 (cli.py 참고).
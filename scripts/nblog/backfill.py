@@ -0,0 +1,316 @@
+from datetime import datetime, timezone
+from collections import deque
+from itertools import islice
+from . import metrics
+from .metrics import log
+from .feed_cache import fetch_feed
+from .common import (BLOGGER_API, BATCH_API, rss_url, require_env, get_client, normalize_link, source_marker,
+                     summarize, render_content, fetch_remote_snapshot, already_posted, already_posted_many)
+
+# 사용법
+#
+# # 1) 가장 오래된 글부터 5개 백필
+# python -m nblog backfill --max 5 --oldest-first
+#
+# # 2) 최신글 10개는 건너뛰고 그 다음 20개 백필
+# python -m nblog backfill --skip 10 --max 20 --oldest-first
+#
+# # 3) 날짜 범위로 백필 (예: 2024-01-01 ~ 2024-12-31)
+# python -m nblog backfill --since 2024-01-01 --until 2024-12-31 --oldest-first
+#
+# # 4) 이미 올린 글이라도 강제로 다시 올리기
+# python -m nblog backfill --max 3 --force
+#
+# # 5) 리허설(실제 업로드 X)
+# python -m nblog backfill --max 10 --dry-run
+#
+# # 6) posts.list로 원격 글 목록을 한 번에 받아와 중복 체크 (검색 API 호출 없음)
+# python -m nblog backfill --oldest-first --snapshot
+#
+# # 7) 발행 장부 없이(매번 원격 검색으로만) 중복 체크
+# python -m nblog backfill --max 10 --ledger ""
+#
+# # 8) 수만 건짜리 아카이브 피드: 스트리밍 파서로 메모리 일정하게
+# RSS_URL=./archive.xml python -m nblog backfill --stream --oldest-first --max 100
+#
+# # 9) 워커 8개, 초당 1건까지 동시 발행 (429면 자동으로 속도/동시성 축소)
+# python -m nblog backfill --workers 8 --rate 1.0
+#
+# # 10) 원문이 수정된 글만 기존 Blogger 글에 PATCH (바뀐 게 없으면 API 호출 0)
+# python -m nblog backfill --sync
+#
+# # 11) 중간에 끊긴 작업 이어서 (시작할 때 찍힌 [job] 이름, 실패했던 글은 맨 뒤에 다시 시도)
+# python -m nblog backfill --resume 20250101-093000
+#
+# # 12) 중복 확인 검색/발행을 50개씩 batch 요청 하나로 (실패한 파트만 재시도)
+# python -m nblog backfill --batch 50
+
+def parse_date(s):
+    from dateutil import parser as dtparse
+    return dtparse.parse(s)
+
+def entry_dt(e) -> datetime:
+    # feedparser의 published_parsed/updated_parsed → datetime(UTC)
+    for k in ("published_parsed","updated_parsed"):
+        t = e.get(k)
+        if t: return datetime(*t[:6], tzinfo=timezone.utc)
+    # 폴백: 문자열 파싱
+    for k in ("published","updated"):
+        s = e.get(k)
+        if s:
+            try: return parse_date(s).astimezone(timezone.utc)
+            except: pass
+    return None
+
+def fetch_entries(rss_url, stream=False):
+    # 조건부 GET 캐시 경유. 백필은 매번 범위가 달라 304여도 캐시 본문으로 그대로 진행
+    path = fetch_feed(rss_url).path
+    if stream:
+        # 캐시 파일을 직접 iterparse → 항목을 하나씩 흘려보냄 (메모리 일정)
+        from .feed_stream import iter_entries
+        return iter_entries(str(path))
+    import feedparser
+    with metrics.span("feed.parse"):
+        feed = feedparser.parse(path.read_bytes())
+    if feed.bozo:
+        log("[warn] RSS parse error:", feed.bozo_exception)
+    return feed.entries or []
+
+def in_window(e, since=None, until=None):
+    d = entry_dt(e)
+    if not d: return True
+    ok = True
+    if since:
+        ok = ok and (d >= since.replace(tzinfo=timezone.utc))
+    if until:
+        ok = ok and (d <= until.replace(tzinfo=timezone.utc))
+    return ok
+
+def select_candidates(entries, args):
+    """
+    날짜 필터 → (oldest-first) → skip → max 를 제너레이터로 지연 적용.
+    RSS는 최신순이라 oldest-first + max면 뒤쪽 skip+max개만 deque에 남기면 된다.
+    """
+    entries = (e for e in entries if in_window(e, args.since, args.until))
+    if args.oldest_first:
+        tail = deque(entries, maxlen=args.skip + args.max) if args.max else list(entries)
+        entries = reversed(tail)
+    stop = args.skip + args.max if args.max else None
+    return islice(entries, args.skip, stop)
+
+def backfill(args):
+    from .publisher import publish_all, batch_all, TokenBucket
+    from .backfill_job import new_job, load_job
+    from .publish_ledger import open_ledger, ledger_lookup, ledger_record, content_hash
+    blog_id = require_env()
+    # --sync는 바뀐 글이 없으면 토큰도 받지 않는다 (첫 API 호출 때 발급)
+    client = get_client(pool_size=max(4, args.workers), eager=not args.sync)
+    # 속도 제한은 쓰기 호출에만 (장부/해시로 끝나는 항목, 중복 확인 검색은 토큰을 쓰지 않는다)
+    client.limiter = TokenBucket(0 if args.dry_run else args.rate, burst=args.workers)
+
+    if args.resume:
+        # 저널의 후보 목록을 그대로 씀 → 피드도 다시 받지 않고, 끝난 글은 다시 확인하지 않는다
+        # 리허설 재개는 저널을 읽기만 한다 (skipped가 남으면 진짜 재개가 "already complete"가 됨)
+        journal = load_job(args.resume, readonly=args.dry_run)
+        ordered = journal.ordered
+        log(f"[job] resume {journal.job} {journal.counts()}")
+    else:
+        entries = fetch_entries(rss_url("backfill"), stream=args.stream)
+        with metrics.span("feed.select"):
+            entries = list(select_candidates(entries, args))
+        if not entries:
+            log("[info] no entries")
+            return
+        ordered = args.oldest_first
+        # 리허설은 아무것도 올리지 않으니 저널을 남기지 않는다
+        journal = None if args.dry_run else new_job(entries, ordered, args.job)
+        if journal:
+            log(f"[job] {journal.job} → {journal.path}")
+    if journal:
+        entries = [(i, journal.entries[i]) for i in journal.todo()]
+    else:
+        entries = list(enumerate(entries))
+    metrics.incr("entries.candidates", len(entries))
+    if not entries:
+        log("[info] job already complete")
+        return
+
+    log(f"[plan] candidates={len(entries)}")
+
+    ledger = open_ledger(args.ledger)
+    snapshot = fetch_remote_snapshot(client, blog_id) if args.snapshot and not args.force else None
+
+    def sync_check(row, link, title, h):
+        """장부에 있는 글: 제목+요약 해시가 그대로면 "skipped", PATCH가 필요하면 None."""
+        if row["content_hash"] == h:
+            metrics.incr("entries.unchanged")
+            return "skipped"
+        if row["content_hash"] is None:
+            # 해시 도입 전에 올린 글: 지금 내용을 기준으로 삼고 다음 수정부터 감지
+            ledger_record(ledger, link, content_hash=h)
+            metrics.incr("entries.baselined")
+            return "skipped"
+        if args.dry_run:
+            log(f"[dry-run] would update: {title}")
+            metrics.incr("entries.dry_run")
+            return "skipped"
+        return None
+
+    def prepare(e):
+        """API 없이 끝나는 판정. 끝났으면 state, 아니면 (title, link, summary, h, PATCH할 장부 행 또는 None)."""
+        title = e.get("title") or "(제목 없음)"
+        link  = e.get("link")  or ""
+        if not link:
+            log(f"[skip] no link: {title}")
+            metrics.incr("entries.no_link")
+            return "skipped"
+
+        summary = summarize(e.get("summary") or e.get("description") or "")
+        h = content_hash(title, summary)
+        if args.sync and not args.force:
+            row = ledger_lookup(ledger, link)
+            if row and row["blogger_id"]:
+                return sync_check(row, link, title, h) or (title, link, summary, h, row)
+        return title, link, summary, h, None
+
+    def skip_existing(link):
+        log(f"[skip] exists: {normalize_link(link)}")
+        metrics.incr("entries.exists")
+        return "skipped"
+
+    def skip_dry_run(title):
+        log(f"[dry-run] would post: {title}")
+        metrics.incr("entries.dry_run")
+        return "skipped"
+
+    def call_for(title, link, summary, row):
+        """발행 호출 (method, url, body): 장부에 있는 글은 PATCH, 새 글은 insert."""
+        content = render_content(title, link, summary)
+        if row:
+            return "PATCH", f"{BLOGGER_API}/blogs/{blog_id}/posts/{row['blogger_id']}", {"title": title, "content": content}
+        return "POST", f"{BLOGGER_API}/blogs/{blog_id}/posts/", {"kind":"blogger#post", "title": title, "content": content, "labels": ["from-naver"]}
+
+    def done(link, h, row, res):
+        """발행 응답을 장부/스냅샷에 반영하고 state."""
+        ledger_record(ledger, link, res.get("id"), res.get("url"), h)
+        if row:
+            log(f"[updated] {res.get('url') or row['url']}")
+            metrics.incr("entries.updated")
+            return "updated"
+        log(f"[created] {res.get('url')}")
+        metrics.incr("entries.posted")
+        if snapshot is not None:
+            snapshot["markers"][source_marker(link)] = (res.get("id"), res.get("url"))
+        return "created"
+
+    def record(i, state):
+        if journal:
+            journal.record(i, "posted" if state == "created" else state)
+        return state
+
+    def run_one(item):
+        i, e = item
+        return record(i, publish_one(e))
+
+    def publish_one(e):
+        p = prepare(e)
+        if isinstance(p, str):
+            return p
+        title, link, summary, h, row = p
+        if not row:
+            if not args.force:
+                with metrics.span("dedupe"):
+                    exists = already_posted(client, blog_id, link, ledger, snapshot)
+                if exists:
+                    return skip_existing(link)
+            if args.dry_run:
+                return skip_dry_run(title)
+        method, url, body = call_for(title, link, summary, row)
+        with metrics.span("publish"):
+            res = client.patch(url, body) if row else client.post(url, body)
+        return done(link, h, row, res)
+
+    def publish_batched(items):
+        """
+        --batch N: 중복 확인 검색과 발행/수정 호출을 N개씩 multipart 배치 요청으로.
+        배치 안에서는 실패한 파트만 다시 보낸다. 결과 모양은 publish_all과 같다.
+        """
+        retry = dict(max_retries=args.max_retries, log=log)
+        results = [None] * len(items)
+        todo = []   # (k, title, link, summary, h, row)
+        queued = set()
+        for k, (i, e) in enumerate(items):
+            p = prepare(e)
+            if not isinstance(p, str) and normalize_link(p[1]) in queued:
+                # 같은 글이 두 번: 단건 모드라면 앞 글이 장부에 남아 뒤 글은 건너뛴다
+                p = skip_existing(p[1])
+            if isinstance(p, str):
+                results[k] = (items[k], record(i, p), None)
+            else:
+                queued.add(normalize_link(p[1]))
+                todo.append((k, *p))
+
+        fresh = [t for t in todo if not t[5]]
+        if fresh and not args.force:
+            with metrics.span("dedupe"):
+                found, errors = already_posted_many(client, blog_id, [t[2] for t in fresh], ledger, snapshot,
+                                                    size=args.batch, **retry)
+            left = []
+            for t in todo:
+                k, link = t[0], t[2]
+                if t[5] or not (found.get(link) or link in errors):
+                    left.append(t)
+                elif link in errors:
+                    results[k] = (items[k], None, errors[link])
+                else:
+                    results[k] = (items[k], record(items[k][0], skip_existing(link)), None)
+            todo = left
+        if args.dry_run:
+            for t in [t for t in todo if not t[5]]:
+                results[t[0]] = (items[t[0]], record(items[t[0]][0], skip_dry_run(t[1])), None)
+            todo = [t for t in todo if t[5]]
+
+        def call(t):
+            return call_for(t[1], t[2], t[3], t[5])
+
+        def finish(t, res):
+            return record(items[t[0]][0], done(t[2], t[4], t[5], res))
+
+        for t, state, err in batch_all(todo, call, finish, client, BATCH_API, size=args.batch, **retry):
+            results[t[0]] = (items[t[0]], state, err)
+        return results
+
+    if args.batch > 1 and ordered:
+        # 배치 안 파트의 실행 순서는 보장되지 않는다 → 오래된 순 발행은 단건으로
+        log("[info] --batch ignored with --oldest-first (batch parts run in any order)")
+    if args.batch > 1 and not ordered:
+        results = publish_batched(entries)
+    else:
+        # 오래된 순 발행은 Blogger 게시 시각 순서를 지켜야 하므로 직렬(ordered)로 처리
+        results = publish_all(
+            entries, run_one,
+            workers=args.workers,
+            limiter=client.limiter,
+            max_retries=args.max_retries,
+            ordered=ordered,
+            log=log,
+        )
+    posted = sum(1 for _, r, _ in results if r == "created")
+    updated = sum(1 for _, r, _ in results if r == "updated")
+    failed = [(item, err) for item, _, err in results if err is not None]
+    for (i, e), err in failed:
+        log(f"[fail] {normalize_link(e.get('link') or '')}: {err}")
+        if journal:
+            journal.record(i, "failed", f"{type(err).__name__}: {err}")
+    metrics.incr("entries.failed", len(failed))
+
+    log(f"[done] posted={posted} updated={updated} failed={len(failed)}")
+    if journal:
+        journal.close()
+        if failed and not args.dry_run:
+            log(f"[job] {journal.job} has failures, retry with --resume {journal.job}")
+    return len(failed)
+
+def run(args):
+    if backfill(args):
+        raise SystemExit(1)
@@ -0,0 +1,104 @@
+import os, json, time, pathlib, threading
+
+# 백필 작업 저널 (재개용 체크포인트)
+#
+# .cache/jobs/<job>.jsonl
+#   1행: {"type": "plan", "job", "created", "ordered", "entries": [{title, link, summary}, ...]}
+#   이후: {"type": "state", "i": 후보 번호, "state": posted|updated|skipped|failed, "error"}
+#
+# 상태 한 줄마다 flush + fsync → 중간에 죽어도 마지막 체크포인트까지는 남는다.
+# 같은 번호의 상태가 여러 줄이면 마지막 줄이 이긴다 (실패 후 재시도 성공 등).
+
+JOBS_DIR = os.environ.get("BACKFILL_JOBS", ".cache/jobs")
+DONE = {"posted", "updated", "skipped"}
+
+def _job_path(job, jobs_dir):
+    p = pathlib.Path(job)
+    # 이름만 주면 jobs_dir 안에서, 경로를 주면 그대로
+    return p if p.suffix == ".jsonl" else pathlib.Path(jobs_dir) / f"{job}.jsonl"
+
+class Journal:
+    def __init__(self, path, job, entries, ordered, states=None, readonly=False):
+        self.path = path
+        self.job = job
+        self.entries = entries
+        self.ordered = ordered
+        self.states = states or {}  # 번호 → {"state", "error"}
+        self._lock = threading.Lock()
+        # 읽기 전용(--dry-run 재개)이면 상태를 메모리에만 둔다 → 진짜 재개 때 그대로 다시 시도
+        self._f = None if readonly else open(path, "a", encoding="utf-8")
+
+    def _append(self, obj):
+        if self._f is None:
+            return
+        self._f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def record(self, i, state, error=None):
+        with self._lock:
+            self.states[i] = {"state": state, "error": error}
+            self._append({"type": "state", "i": i, "state": state, "error": error})
+
+    def todo(self):
+        """아직 안 끝난 후보 번호: 처음 시도하는 것 먼저, 실패했던 것은 맨 뒤에 다시."""
+        pending = [i for i in range(len(self.entries)) if i not in self.states]
+        failed = [i for i, s in self.states.items() if s["state"] not in DONE]
+        return pending + failed
+
+    def counts(self):
+        c = {"pending": len(self.entries) - len(self.states)}
+        for s in self.states.values():
+            c[s["state"]] = c.get(s["state"], 0) + 1
+        return c
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+
+def new_job(entries, ordered, job=None, jobs_dir=JOBS_DIR):
+    """후보 목록을 plan 줄로 남기고 Journal을 연다."""
+    if job is None:
+        # 기본 이름은 시작 시각, 같은 초에 시작한 작업이 있으면 -2, -3 …
+        stamp = job = time.strftime("%Y%m%d-%H%M%S")
+        n = 1
+        while _job_path(job, jobs_dir).exists():
+            n += 1
+            job = f"{stamp}-{n}"
+    path = _job_path(job, jobs_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        raise SystemExit(f"job already exists: {path} (재개는 --resume {job})")
+    plan = [{"title": e.get("title"), "link": e.get("link"),
+             "summary": e.get("summary") or e.get("description") or ""} for e in entries]
+    journal = Journal(path, job, plan, ordered)
+    journal._append({"type": "plan", "job": job, "created": int(time.time()), "ordered": ordered, "entries": plan})
+    return journal
+
+def load_job(job, jobs_dir=JOBS_DIR, readonly=False):
+    """저널을 다시 읽어 plan과 마지막 상태를 복원한다. 끝이 잘린 마지막 줄은 무시.
+    readonly면 파일은 건드리지 않는다 (record는 메모리에만)."""
+    path = _job_path(job, jobs_dir)
+    if not path.exists():
+        raise SystemExit(f"no such job: {path}")
+    plan, states = None, {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # 기록 도중 죽어서 반쯤 쓰인 줄
+            if rec.get("type") == "plan":
+                plan = rec
+            elif rec.get("type") == "state":
+                states[rec["i"]] = {"state": rec["state"], "error": rec.get("error")}
+    if plan is None:
+        raise SystemExit(f"job has no plan line: {path}")
+    if readonly:
+        return Journal(path, plan["job"], plan["entries"], plan.get("ordered", False), states, readonly=True)
+    with open(path, "rb+") as f:
+        # 잘린 줄 뒤에 이어 쓰지 않도록 줄바꿈으로 닫아 둔다
+        f.seek(-1, 2)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+    return Journal(path, plan["job"], plan["entries"], plan.get("ordered", False), states)
@@ -0,0 +1,191 @@
+import os, re, json, time, uuid, email, hashlib, pathlib, threading
+from urllib.parse import urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.adapters import HTTPAdapter
+from . import metrics
+
+# Blogger API 공용 클라이언트
+#
+# - keep-alive 커넥션 풀(requests.Session) 하나로 모든 호출 처리 → 호출마다 TLS 핸드셰이크 X
+# - access token은 expires_in 까지 메모리에 캐시 (BLOGGER_TOKEN_CACHE 지정 시 디스크에도)
+# - 401이 오면 토큰을 새로 받아 한 번만 재시도
+# - limiter(acquire(n)을 가진 객체, 예: publisher.TokenBucket)를 걸면 쓰기 호출마다 토큰을 쓴다
+#   (GET은 제한 없음, batch는 안에 든 쓰기 파트 수만큼)
+# - batch(): 여러 호출을 multipart/mixed 한 요청으로 (인증 헤더/왕복 1회). 파트별 응답은 Response로 돌려준다
+
+TOKEN_URL   = os.environ.get("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+TOKEN_CACHE = os.environ.get("BLOGGER_TOKEN_CACHE", "")  # 예: .cache/blogger_token.json
+EXPIRY_MARGIN = 60  # 만료 60초 전부터는 새로 발급
+
+def endpoint_name(method, url):
+    """계측용 엔드포인트 이름: posts.search / posts.list / posts.insert / posts.patch …"""
+    path = urlsplit(url).path.rstrip("/")
+    if path.endswith("/batch/blogger/v3"):
+        return "batch"
+    if path.endswith("/posts/search"):
+        return "posts.search"
+    if path.endswith("/posts"):
+        return "posts.insert" if method == "POST" else "posts.list"
+    if "/posts/" in path:
+        return {"GET": "posts.get", "PATCH": "posts.patch", "PUT": "posts.update", "DELETE": "posts.delete"}.get(method, "posts")
+    return "other"
+
+class BloggerClient:
+    def __init__(self, client_id, client_secret, refresh_token,
+                 token_cache=TOKEN_CACHE, pool_size=10, timeout=30):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = refresh_token
+        self.token_cache = pathlib.Path(token_cache) if token_cache else None
+        self.timeout = timeout
+        # 캐시 파일이 다른 계정 토큰을 돌려주지 않도록 refresh token 지문으로 구분
+        self.fingerprint = hashlib.sha256(f"{client_id}:{refresh_token}".encode()).hexdigest()[:16]
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.limiter = None     # 초당 쓰기 호출 수 제한. 없으면 제한 없음
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._load_cached_token()
+
+    # ----- token -----
+
+    def _load_cached_token(self):
+        if not self.token_cache:
+            return
+        try:
+            js = json.loads(self.token_cache.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if js.get("fingerprint") == self.fingerprint and js.get("expires_at", 0) - EXPIRY_MARGIN > time.time():
+            self._token, self._expires_at = js["access_token"], js["expires_at"]
+
+    def _save_cached_token(self):
+        if not self.token_cache:
+            return
+        self.token_cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.token_cache.with_suffix(".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "access_token": self._token,
+                       "expires_at": self._expires_at}, f)
+        os.replace(tmp, self.token_cache)
+
+    def access_token(self, force=False):
+        with self._lock:
+            if force or not self._token or self._expires_at - EXPIRY_MARGIN <= time.time():
+                with metrics.span("http.token"):
+                    r = self.session.post(TOKEN_URL, data={
+                        "client_id": self.client_id,
+                        "client_secret": self.client_secret,
+                        "refresh_token": self.refresh_token,
+                        "grant_type": "refresh_token",
+                    }, timeout=self.timeout)
+                metrics.http("token", r.status_code)
+                r.raise_for_status()
+                js = r.json()
+                self._token = js["access_token"]
+                self._expires_at = time.time() + int(js.get("expires_in", 3600))
+                self._save_cached_token()
+            return self._token
+
+    # ----- API -----
+
+    def request(self, method, url, writes=None, **kw):
+        """
+        인증 헤더를 붙여 호출. 401이면 토큰 갱신 후 1회 재시도. 응답 객체를 그대로 돌려준다.
+        writes: limiter에서 받을 토큰 수 (기본: GET이면 0, 아니면 1).
+        """
+        kw.setdefault("timeout", self.timeout)
+        kw["writes"] = int(method != "GET") if writes is None else writes
+        token = self.access_token()
+        r = self._send(method, url, token, **kw)
+        if r.status_code == 401:
+            with self._lock:
+                stale = self._token == token
+            token = self.access_token(force=stale)
+            r = self._send(method, url, token, **kw)
+        return r
+
+    def _send(self, method, url, token, headers=None, writes=0, **kw):
+        ep = endpoint_name(method, url)
+        if self.limiter is not None and writes:
+            with metrics.span("http.wait"):
+                self.limiter.acquire(writes)
+        with metrics.span(f"http.{ep}"):
+            r = self.session.request(method, url, headers={**(headers or {}), "Authorization": f"Bearer {token}"}, **kw)
+        metrics.http(ep, r.status_code, len(r.content))
+        return r
+
+    def get(self, url, params=None):
+        r = self.request("GET", url, params=params)
+        r.raise_for_status()
+        return r.json()
+
+    def post(self, url, json):
+        r = self.request("POST", url, json=json)
+        r.raise_for_status()
+        return r.json()
+
+    def patch(self, url, json):
+        """부분 수정 (posts.patch): json에 담긴 필드만 바뀐다."""
+        r = self.request("PATCH", url, json=json)
+        r.raise_for_status()
+        return r.json()
+
+    def batch(self, calls, batch_url):
+        """
+        calls: [(method, url, json 또는 None)] 를 multipart/mixed 요청 하나로 보낸다.
+        파트별 결과를 입력 순서대로 requests.Response 로 (raise_for_status/json 은 단건과 같게).
+        배치 요청 자체가 실패하면 HTTPError. 응답에서 빠진 파트는 502로 채워 재시도 대상이 되게 한다.
+        """
+        boundary = "nblog_" + uuid.uuid4().hex
+        chunks = []
+        for k, (method, url, body) in enumerate(calls):
+            p = urlsplit(url)
+            head = f"{method} {p.path}{'?' + p.query if p.query else ''} HTTP/1.1\r\n"
+            if body is not None:
+                head += "Content-Type: application/json; charset=UTF-8\r\n"
+            chunks.append(f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <item-{k}>\r\n\r\n"
+                          f"{head}\r\n{json.dumps(body) if body is not None else ''}\r\n")
+        payload = ("".join(chunks) + f"--{boundary}--\r\n").encode("utf-8")
+        r = self.request("POST", batch_url, writes=sum(m != "GET" for m, _, _ in calls), data=payload,
+                         headers={"Content-Type": f"multipart/mixed; boundary={boundary}"})
+        r.raise_for_status()
+        return parse_batch(r, calls)
+
+def parse_batch(r, calls):
+    """multipart/mixed 배치 응답 → 파트별 Response (Content-ID <response-item-k> 로 순서 맞춤)."""
+    msg = email.message_from_bytes(b"Content-Type: " + r.headers.get("Content-Type", "").encode("latin-1")
+                                   + b"\r\n\r\n" + r.content)
+    out = [None] * len(calls)
+    for part in msg.get_payload() if msg.is_multipart() else []:
+        m = re.search(r"(\d+)>?$", part.get("Content-ID") or "")
+        k = int(m.group(1)) if m else None
+        if k is None or not 0 <= k < len(calls):
+            continue
+        raw = part.get_payload(decode=True) or b""
+        head, _, body = raw.partition(b"\r\n\r\n") if b"\r\n\r\n" in raw else raw.partition(b"\n\n")
+        out[k] = _part_response(head, body, calls[k])
+    for k, resp in enumerate(out):
+        if resp is None:
+            out[k] = _part_response(b"HTTP/1.1 502 Missing batch part", b"", calls[k])
+    return out
+
+def _part_response(head, body, call):
+    method, url, _ = call
+    lines = head.decode("latin-1").splitlines()
+    status = (lines[0] if lines else "").split(" ", 2)
+    resp = requests.Response()
+    resp.status_code = int(status[1]) if len(status) > 1 and status[1].isdigit() else 502
+    resp.reason = status[2] if len(status) > 2 else ""
+    resp.headers = CaseInsensitiveDict({k.strip(): v.strip() for k, v in (l.split(":", 1) for l in lines[1:] if ":" in l)})
+    resp._content = body
+    resp.url = url
+    metrics.http(endpoint_name(method, url), resp.status_code, len(body))
+    return resp
@@ -0,0 +1,709 @@
+import os, shutil, pathlib, datetime, textwrap, re, urllib.parse, json, hashlib, heapq, itertools, calendar, threading, collections
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from html import escape
+from . import feed_cache, metrics
+from .metrics import log
+from .html_text import html_to_text
+from .common import rss_urls
+
+BASE_URL = os.environ.get("BASE_URL", "").rstrip("/")
+# 여러 피드를 쉼표/공백으로 구분해 넣으면 하나의 사이트로 합친다
+RSS_URLS = rss_urls()
+SITE_TITLE = os.environ.get("SITE_TITLE", "네이버 블로그 최신 글")
+SITE_DESC = os.environ.get("SITE_DESC", "네이버 블로그 최신 글 모음 (자동 갱신)")
+SITE_META = os.environ.get("SITE_META", "")
+MAX_ITEMS = int(os.environ.get("MAX_ITEMS", "40"))
+# 개별 페이지에 보여줄 요약 글자 수 (HTML을 벗긴 텍스트 기준)
+ITEM_SUMMARY_LIMIT = int(os.environ.get("ITEM_SUMMARY_LIMIT", "1000"))
+# 목록 페이지당 글 수 (기본 MAX_ITEMS), sitemap shard 당 URL 수 (프로토콜 한도 50,000)
+PAGE_SIZE = int(os.environ.get("PAGE_SIZE", str(MAX_ITEMS)))
+SITEMAP_SHARD_SIZE = int(os.environ.get("SITEMAP_SHARD_SIZE", "5000"))
+# 개별 페이지 렌더 프로세스 수(0=CPU 수)와 파일 쓰기 스레드 수
+# BUILD_WORKERS=1이면 쓰기 스레드도 기본 1 → 렌더/쓰기 모두 기존처럼 직렬 (비교용. WRITE_WORKERS로 따로 지정 가능)
+_BUILD_WORKERS = int(os.environ.get("BUILD_WORKERS", "0"))
+BUILD_WORKERS = _BUILD_WORKERS or os.cpu_count() or 1
+WRITE_WORKERS = int(os.environ.get("WRITE_WORKERS", "1" if _BUILD_WORKERS == 1 else "8"))
+RENDER_CHUNK = 256
+# true면 피드가 304여도 다시 빌드 (코드/템플릿 변경 배포 시)
+FORCE_BUILD = os.environ.get("FORCE_BUILD", "false").lower() == "true"
+# 글마다 첫 이미지를 받아 dist/thumbs/ 에 두고 개별 페이지에 표시 (false면 텍스트만)
+THUMBNAILS = os.environ.get("THUMBNAILS", "true").lower() == "true"
+
+# index 링크 대상: naver(기본) | local
+INDEX_LINK_TARGET = os.environ.get("INDEX_LINK_TARGET", "naver").lower()
+
+OUT_DIR = pathlib.Path("dist")
+POSTS_DIR = OUT_DIR / "posts"
+
+# 증분 빌드 manifest: 페이지별 렌더 결과 해시 + lastmod (dist 밖에 두어 배포되지 않게)
+MANIFEST_PATH = pathlib.Path(os.environ.get("BUILD_MANIFEST", ".cache/build_manifest.json"))
+
+# 렌더 시점에는 모르는 lastmod 자리. 해시는 이 자리표시자가 들어간 채로 계산한다
+LASTMOD_STAMP = "\x00lastmod\x00"
+
+# ---------- helpers ----------
+
+def slugify(text: str) -> str:
+    text = text.strip().lower()
+    text = re.sub(r"[^\w\s-]", "", text, flags=re.UNICODE)
+    text = re.sub(r"[\s_-]+", "-", text)
+    text = re.sub(r"^-+|-+$", "", text)
+    return text or "post"
+
+def now_iso8601() -> str:
+    return datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+def to_iso8601(dt_struct) -> str:
+    """feedparser의 *_parsed 를 ISO8601Z로 변환."""
+    if not dt_struct:
+        return now_iso8601()
+    dt = datetime.datetime(*dt_struct[:6], tzinfo=datetime.timezone.utc)
+    return dt.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+def to_mobile_naver_url(url: str) -> str:
+    """
+    네이버 블로그 링크를 모바일 정규화:
+    - https://blog.naver.com/do_run_/223... -> https://m.blog.naver.com/do_run_/223...
+    - https://blog.naver.com/PostView.nhn?blogId=do_run_&logNo=223... -> https://m.blog.naver.com/do_run_/223...
+    - 이미 m.blog.naver.com 이면 그대로 유지
+    """
+    if not url:
+        return url
+    parsed = urllib.parse.urlparse(url)
+
+    # 이미 모바일이면 그대로
+    if parsed.netloc.startswith("m.blog.naver.com"):
+        return url
+
+    # 일반 형식: /{blogId}/{logNo}
+    m1 = re.match(r"^/([^/]+)/(\d+)$", parsed.path)
+    if parsed.netloc.startswith("blog.naver.com") and m1:
+        blog_id, log_no = m1.groups()
+        return f"https://m.blog.naver.com/{blog_id}/{log_no}"
+
+    # PostView.nhn 형식
+    if parsed.netloc.startswith("blog.naver.com") and parsed.path.lower().endswith("postview.nhn"):
+        qs = urllib.parse.parse_qs(parsed.query or "")
+        blog_id = (qs.get("blogId") or qs.get("blogid") or [""])[0]
+        log_no  = (qs.get("logNo")  or qs.get("logno")  or [""])[0]
+        if blog_id and log_no:
+            return f"https://m.blog.naver.com/{blog_id}/{log_no}"
+
+    # 그 외는 netloc만 m.으로 바꿔 시도
+    if parsed.netloc.startswith("blog.naver.com"):
+        return urllib.parse.urlunparse(parsed._replace(netloc="m.blog.naver.com"))
+
+    return url
+
+def slug_and_id(e):
+    """제목 slug + 링크 속 숫자 ID(6자리 이상)로 slug 기본형과 글 ID를 만든다."""
+    base = slugify(e.get("title") or "")
+    q = urllib.parse.urlparse(e.get("link", ""))
+    id_hint = re.findall(r"\d{6,}", q.path + "?" + (q.query or ""))
+    post_id = id_hint[-1] if id_hint else None
+    if post_id:
+        base = f"{base}-{post_id}"
+    return base or "post", post_id
+
+# ---------- templates ----------
+
+class Template:
+    """
+    {{name}} 자리표시자 템플릿. dedent와 분할은 생성 시 한 번만 하고,
+    render는 고정 조각과 값 조각을 join만 한다. (CSS 중괄호는 이스케이프 불필요)
+    """
+    FIELD = re.compile(r"\{\{(\w+)\}\}")
+
+    def __init__(self, text):
+        parts = self.FIELD.split(textwrap.dedent(text))
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+
+    def partial(self, **values):
+        """빌드 동안 바뀌지 않는 값을 고정 조각에 미리 합쳐 둔 새 템플릿."""
+        t = Template("")
+        t.literals, t.names = [self.literals[0]], []
+        for name, lit in zip(self.names, self.literals[1:]):
+            if name in values:
+                t.literals[-1] += values[name] + lit
+            else:
+                t.names.append(name)
+                t.literals.append(lit)
+        return t
+
+    def render(self, **values):
+        out = [self.literals[0]]
+        for name, lit in zip(self.names, self.literals[1:]):
+            out.append(values[name])
+            out.append(lit)
+        return "".join(out)
+
+LIST_PAGE = Template("""\
+    <!doctype html>
+    <html lang="ko">
+    <head>
+      <meta charset="utf-8">
+      {{site_meta}}
+      <meta name="viewport" content="width=device-width,initial-scale=1">
+      <title>{{page_title}}</title>
+      <meta name="description" content="{{site_desc}}">
+      <style>
+        body{font-family:system-ui,-apple-system,Segoe UI,Roboto,sans-serif;margin:2rem;line-height:1.6}
+        h1{margin-bottom:.25rem}
+        .sub{color:#666;margin-bottom:1.5rem}
+        ul{padding-left:1.2rem}
+        li{margin:.4rem 0}
+        .date{color:#888;font-size:.9em}
+        nav{margin:1rem 0}
+        footer{margin-top:2rem;color:#888;font-size:.9em}
+      </style>
+    </head>
+    <body>
+      <h1><a href="{{base_url}}/" style="color:inherit;text-decoration:none">{{site_title}}</a></h1>
+      <div class="sub">{{sub}}</div>
+      <ul>
+        {{items}}
+      </ul>
+      <nav>{{nav}}</nav>
+      <footer>Last update: {{lastmod}} · Source RSS: {{sources}}</footer>
+    </body>
+    </html>
+    """).partial(
+    site_meta=SITE_META,
+    site_desc=escape(SITE_DESC),
+    site_title=escape(SITE_TITLE),
+    base_url=BASE_URL,
+    lastmod=LASTMOD_STAMP,
+    sources=", ".join(f'<a href="{escape(u)}">{escape(u)}</a>' for u in RSS_URLS),
+)
+
+ITEM_PAGE = Template("""\
+    <!doctype html>
+    <html lang="ko">
+    <head>
+      <meta charset="utf-8">
+      {{site_meta}}
+      <meta name="viewport" content="width=device-width,initial-scale=1">
+      <title>{{title}}</title>
+      <!-- 정본: 네이버 모바일 버전 -->
+      <link rel="canonical" href="{{naver_link}}">
+      <meta name="robots" content="index,follow">
+      <meta name="description" content="{{title}}">
+      {{og_image}}
+      <style>
+        body{font-family:system-ui,-apple-system,Segoe UI,Roboto,sans-serif;margin:2rem;line-height:1.7}
+        .meta{color:#666;margin:.25rem 0 1rem}
+        .thumb img{max-width:100%;height:auto;border-radius:.5rem}
+        a.btn{display:inline-block;margin-top:1rem;text-decoration:none;padding:.6rem .9rem;border:1px solid #ccc;border-radius:.5rem}
+      </style>
+    </head>
+    <body>
+      <h1>{{title}}</h1>
+      <div class="meta">{{published}}</div>
+      {{thumb}}
+      <div class="content">{{summary}}</div>
+      <p><a class="btn" href="{{naver_link}}">원문(네이버 블로그, 모바일) 보기 →</a></p>
+    </body>
+    </html>
+    """).partial(site_meta=SITE_META)
+
+# 검색 페이지: 질의를 search_index.grams 와 같은 규칙으로 쪼개 필요한 shard만 받아 교집합
+SEARCH_PAGE = Template("""\
+    <!doctype html>
+    <html lang="ko">
+    <head>
+      <meta charset="utf-8">
+      <meta name="viewport" content="width=device-width,initial-scale=1">
+      <title>검색 - {{site_title}}</title>
+      <meta name="robots" content="noindex,follow">
+      <style>
+        body{font-family:system-ui,-apple-system,Segoe UI,Roboto,sans-serif;margin:2rem;line-height:1.6}
+        input{font-size:1.1rem;padding:.4rem .6rem;width:min(30rem,100%)}
+        li{margin:.4rem 0}
+        .date{color:#888;font-size:.9em}
+      </style>
+    </head>
+    <body>
+      <h1><a href="{{base_url}}/" style="color:inherit;text-decoration:none">{{site_title}}</a></h1>
+      <form id="f"><input id="q" type="search" placeholder="검색어 (두 글자 이상)" autofocus></form>
+      <p id="status" class="date"></p>
+      <ul id="results"></ul>
+      <script>
+      const BASE = "{{base_url}}", SHARDS = {{shards}}, BLOCK = {{doc_block}}, MAX = 50;
+      const cache = {};
+      function load(name) {
+        return cache[name] = cache[name] || fetch(BASE + "/search/" + name).then(r => r.ok ? r.json() : {});
+      }
+      function grams(q) {
+        const out = new Set();
+        for (const w of q.normalize("NFKC").toLowerCase().match(/[\\p{L}\\p{N}]+/gu) || []) {
+          const cs = Array.from(w);
+          if (cs.length === 1) out.add(w);
+          for (let i = 0; i + 1 < cs.length; i++) out.add(cs[i] + cs[i + 1]);
+        }
+        return [...out];
+      }
+      function shard(g) {
+        let s = 0;
+        for (const c of g) s += c.codePointAt(0);
+        return s % SHARDS;
+      }
+      function decode(d) {
+        let cur = 0;
+        return d.map(x => cur += x);
+      }
+      async function search(q) {
+        const gs = grams(q), status = document.getElementById("status"), ul = document.getElementById("results");
+        ul.innerHTML = "";
+        if (!gs.length) { status.textContent = ""; return; }
+        const lists = await Promise.all(gs.map(g => load("t-" + shard(g) + ".json").then(t => decode(t[g] || []))));
+        lists.sort((a, b) => a.length - b.length);
+        let hits = new Set(lists[0]);
+        for (const l of lists.slice(1)) { const s = new Set(l); hits = new Set([...hits].filter(x => s.has(x))); }
+        const ids = [...hits].sort((a, b) => b - a);
+        status.textContent = ids.length + "건" + (ids.length > MAX ? " (최근 " + MAX + "건 표시)" : "");
+        const top = ids.slice(0, MAX);
+        const blocks = await Promise.all([...new Set(top.map(i => Math.floor(i / BLOCK)))].map(b => load("d-" + b + ".json").then(d => [b, d])));
+        const docs = Object.fromEntries(blocks);
+        for (const i of top) {
+          const m = docs[Math.floor(i / BLOCK)][i];
+          if (!m) continue;
+          const li = document.createElement("li"), a = document.createElement("a"), d = document.createElement("span");
+          a.href = BASE + "/" + m[1]; a.textContent = m[0];
+          d.className = "date"; d.textContent = " " + m[2];
+          li.append(a, d); ul.append(li);
+        }
+      }
+      const input = document.getElementById("q");
+      document.getElementById("f").addEventListener("submit", e => { e.preventDefault(); search(input.value); });
+      let timer;
+      input.addEventListener("input", () => { clearTimeout(timer); timer = setTimeout(() => search(input.value), 200); });
+      const q0 = new URLSearchParams(location.search).get("q");
+      if (q0) { input.value = q0; search(q0); }
+      </script>
+    </body>
+    </html>
+    """)
+
+# ---------- renderers ----------
+
+def render_index(item_pages, heading="", nav=""):
+    lis = []
+    for e, page_path in item_pages:
+        title = escape(e.get("title", "제목 없음"))
+        naver_link = to_mobile_naver_url(e.get("link", ""))
+        local_url = f"{BASE_URL}/{page_path}"
+        published = e.get("published", "") or e.get("updated", "")
+        href = naver_link if INDEX_LINK_TARGET == "naver" else local_url
+        lis.append(
+            f'<li><a href="{href}">{title}</a>'
+            + (f' <span class="date">{escape(published)}</span>' if published else "")
+            + (' <span style="color:#999;">·</span> '
+               f'<a href="{local_url}" style="font-size:.9em;">mirror</a>' if INDEX_LINK_TARGET=="naver" else
+               f' <span style="color:#999;">·</span> <a href="{naver_link}" style="font-size:.9em;">원문</a>')
+            + '</li>'
+        )
+    return render_list_page(''.join(lis) if lis else '<li>피드 항목이 없습니다.</li>', heading, nav)
+
+def render_archive_index(months):
+    """월별 보관함 목록. months: [("2025/10", 글 수), ...] 최신순."""
+    lis = ''.join(f'<li><a href="{BASE_URL}/archive/{m}/">{m}</a> <span class="date">({n})</span></li>' for m, n in months)
+    return render_list_page(lis or '<li>보관된 글이 없습니다.</li>', "월별 보관함", f'<a href="{BASE_URL}/">← 최신 글</a>')
+
+def render_pager(page, total):
+    def href(n):
+        return f"{BASE_URL}/" if n == 1 else f"{BASE_URL}/page/{n}/"
+    parts = []
+    if page > 1:
+        parts.append(f'<a href="{href(page - 1)}">← 이전</a>')
+    if total > 1:
+        parts.append(f'<span class="date">{page} / {total}</span>')
+    if page < total:
+        parts.append(f'<a href="{href(page + 1)}">다음 →</a>')
+    parts.append(f'<a href="{BASE_URL}/archive/">월별 보관함</a>')
+    parts.append(f'<a href="{BASE_URL}/search.html">검색</a>')
+    return " · ".join(parts)
+
+def render_list_page(items_html, heading="", nav=""):
+    page_title = f"{SITE_TITLE} - {heading}" if heading else SITE_TITLE
+    return LIST_PAGE.render(
+        page_title=escape(page_title),
+        sub=escape(heading or SITE_DESC),
+        items=items_html,
+        nav=nav,
+    )
+
+def render_item_page(e):
+    title = escape(e.get("title", "제목 없음"))
+    summary = e.get("summary", "") or e.get("description", "") or ""
+    thumb = f"{BASE_URL}/{e['thumb']}" if e.get("thumb") else ""
+    return ITEM_PAGE.render(
+        title=title,
+        og_image=f'<meta property="og:image" content="{thumb}">' if thumb else "",
+        thumb=f'<p class="thumb"><img src="{thumb}" alt="" loading="lazy"></p>' if thumb else "",
+        naver_link=to_mobile_naver_url(e.get("link", "#")),
+        published=escape(e.get("published", "") or e.get("updated", "")),
+        summary=escape(html_to_text(summary, ITEM_SUMMARY_LIMIT)) or "요약 없음",
+    )
+
+def render_search_page():
+    from . import search_index
+    return SEARCH_PAGE.render(site_title=escape(SITE_TITLE), base_url=BASE_URL,
+                              shards=str(search_index.SEARCH_SHARDS), doc_block=str(search_index.DOC_BLOCK))
+
+def digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:20]
+
+# 개별 페이지 입력 해시에 들어가는 템플릿 지문. render_item_page의 로직을 바꾸면 ITEM_PAGE_VERSION을 올린다
+ITEM_PAGE_VERSION = 1
+ITEM_PAGE_KEY = digest(json.dumps([ITEM_PAGE_VERSION, ITEM_PAGE.literals, ITEM_PAGE.names, BASE_URL, ITEM_SUMMARY_LIMIT]))
+
+def item_key(e):
+    """개별 페이지 입력 해시: 렌더링에 쓰는 항목 필드 + 썸네일 + 템플릿. 같으면 렌더링 결과도 같다."""
+    fields = [e.get(k) for k in ("title", "summary", "description", "link", "published", "updated", "thumb")]
+    return digest(json.dumps([ITEM_PAGE_KEY, fields], ensure_ascii=False))
+
+def render_items(batch):
+    """[(rel, entry)] → [(rel, html, digest)]. 프로세스 풀 워커에서 실행된다."""
+    out = []
+    for rel, e in batch:
+        text = render_item_page(e)
+        out.append((rel, text, digest(text)))
+    return out
+
+# ---------- feeds ----------
+
+def entry_ts(e) -> int:
+    t = e.get("published_parsed") or e.get("updated_parsed")
+    return calendar.timegm(t) if t else 0
+
+def fetch_one(url):
+    """피드 하나 받기. (url, not_modified, body). 실패하면 마지막 성공본으로 폴백 (없으면 body=None)."""
+    try:
+        res = feed_cache.fetch_feed(url, consumer="build")
+        return url, res.not_modified, res.path.read_bytes()
+    except Exception as exc:
+        path = feed_cache.cached_copy(url)
+        log(f"[warn] feed fetch failed: {url}: {exc}" + (" (using cached copy)" if path else ""))
+        return url, False, path.read_bytes() if path else None
+
+def parse_feed(url, body):
+    """본문 → 최신순 항목 목록. 전부 304인 실행은 여기까지 오지 않아 feedparser를 불러오지 않는다."""
+    if body is None:
+        return []
+    import feedparser
+    with metrics.span("feed.parse"):
+        feed = feedparser.parse(body)
+    if feed.bozo:
+        log(f"[warn] RSS parse error: {url}: {feed.bozo_exception}")
+    # 피드 안에서도 최신순 보장 (merge 전제조건)
+    return sorted(feed.entries, key=entry_ts, reverse=True)
+
+def fetch_all(urls):
+    """모든 피드를 동시에 받는다. 피드별 하드 타임아웃이 있어 전체 시간 ≈ 가장 느린 피드."""
+    with ThreadPoolExecutor(max_workers=min(8, len(urls)) or 1) as pool:
+        return list(pool.map(fetch_one, urls))
+
+def merge_entries(feeds, limit):
+    """최신순 k-way merge + 정규화 링크 기준 중복 제거, 상위 limit개."""
+    merged = heapq.merge(*feeds, key=entry_ts, reverse=True)
+    seen = set()
+    def unique():
+        for e in merged:
+            key = to_mobile_naver_url(e.get("link", "")) or id(e)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield e
+    return list(itertools.islice(unique(), limit))
+
+# ---------- incremental output ----------
+
+def load_manifest():
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"pages": {}}
+
+def render_urlset(urls):
+    """urls: [(loc, lastmod, changefreq, priority)]"""
+    body = "\n".join(
+        f"<url><loc>{loc}</loc><lastmod>{lastmod}</lastmod><changefreq>{freq}</changefreq><priority>{prio}</priority></url>"
+        for loc, lastmod, freq, prio in urls
+    )
+    return "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n" \
+           "<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n" + body + "\n</urlset>\n"
+
+def render_sitemap_index(sitemaps):
+    """sitemaps: [(loc, lastmod)]"""
+    body = "\n".join(f"<sitemap><loc>{loc}</loc><lastmod>{lastmod}</lastmod></sitemap>" for loc, lastmod in sitemaps)
+    return "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n" \
+           "<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n" + body + "\n</sitemapindex>\n"
+
+def render_all(jobs):
+    """
+    [(rel, entry)]를 렌더링해 (rel, html, digest)를 입력 순서대로 흘려보낸다.
+    프로세스 풀에는 워커 수의 두 배만큼만 chunk를 걸어 둔다 → 렌더 결과가 소비보다 앞서 쌓이지 않는다.
+    """
+    if BUILD_WORKERS <= 1 or len(jobs) <= RENDER_CHUNK:
+        yield from render_items(jobs)
+        return
+    window = collections.deque()
+    with ProcessPoolExecutor(max_workers=BUILD_WORKERS) as pool:
+        for i in range(0, len(jobs), RENDER_CHUNK):
+            window.append(pool.submit(render_items, jobs[i:i + RENDER_CHUNK]))
+            if len(window) >= BUILD_WORKERS * 2:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+
+def write_file(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+class FileWriter:
+    """
+    제한된 스레드 풀로 파일 쓰기. 대기 중인 쓰기 수도 제한해 렌더 결과가 메모리에 쌓이지 않게 한다.
+    workers가 1 이하면 호출 스레드에서 바로 쓴다.
+    """
+    def __init__(self, workers):
+        self.pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        self.slots = threading.BoundedSemaphore(max(1, workers) * 4)
+        self.error = None
+
+    def write(self, path, text):
+        if self.pool is None:
+            write_file(path, text)
+            return
+        self.slots.acquire()
+        self.pool.submit(write_file, path, text).add_done_callback(self._done)
+
+    def _done(self, fut):
+        self.slots.release()
+        if fut.exception() and self.error is None:
+            self.error = fut.exception()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+        if self.error:
+            raise self.error
+
+def save_manifest(manifest):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+
+def reuse(rel, key, manifest, stats):
+    """입력 해시(item_key)가 지난 빌드와 같고 파일도 있으면 렌더링 없이 지난 lastmod, 아니면 None."""
+    prev = manifest["pages"].get(rel)
+    if not prev or prev.get("input") != key or not (OUT_DIR / rel).exists():
+        return None
+    stats["seen"].add(rel)
+    stats["skipped"] += 1
+    return prev["lastmod"]
+
+def emit(rel, text, manifest, stats, first_lastmod=None, h=None, key=None):
+    """
+    내용 해시가 이전 빌드와 같고 파일도 있으면 쓰지 않는다.
+    lastmod는 내용이 바뀐 경우에만 now로 갱신 (처음 생긴 페이지는 first_lastmod).
+    text 안의 LASTMOD_STAMP는 최종 lastmod로 치환해서 쓴다. (h: 미리 계산한 해시, key: 입력 해시 → 다음 빌드의 reuse)
+    """
+    pages = manifest["pages"]
+    stats["seen"].add(rel)
+    h = h or digest(text)
+    prev = pages.get(rel)
+    path = OUT_DIR / rel
+    if prev and prev["hash"] == h and path.exists():
+        if key:
+            prev["input"] = key
+        stats["skipped"] += 1
+        return prev["lastmod"]
+    if prev is None:
+        lastmod = first_lastmod or now_iso8601()
+    elif prev["hash"] != h:
+        lastmod = now_iso8601()
+    else:  # 내용은 같은데 파일만 없어진 경우
+        lastmod = prev["lastmod"]
+    stats["writer"].write(path, text.replace(LASTMOD_STAMP, lastmod) if LASTMOD_STAMP in text else text)
+    pages[rel] = {"hash": h, "lastmod": lastmod, **({"input": key} if key else {})}
+    stats["written"] += 1
+    return lastmod
+
+def emit_copy(rel, src, manifest, stats):
+    """이름이 곧 내용 해시인 파일(썸네일)을 복사. 이미 있으면 그대로 둔다."""
+    stats["seen"].add(rel)
+    path = OUT_DIR / rel
+    if rel in manifest["pages"] and path.exists():
+        stats["skipped"] += 1
+        return rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, path)  # 같은 파일시스템이면 하드링크 (캐시에서 지워져도 dist 쪽은 남는다)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copyfile(src, path)
+    manifest["pages"][rel] = {"hash": pathlib.Path(rel).stem, "lastmod": now_iso8601()}
+    stats["written"] += 1
+    return rel
+
+def attach_thumbs(entries, manifest, stats):
+    """글마다 첫 이미지를 캐시에서 찾거나 받아 dist/thumbs/ 에 두고 e["thumb"]에 상대 경로를 단다."""
+    from . import thumbs
+    cache = thumbs.ThumbCache()
+    got = cache.fetch([(e["image"], e.get("link")) for e in entries if e.get("image")])
+    for e in entries:
+        name = got.get(e.get("image"))
+        if name:
+            e["thumb"] = emit_copy(f"thumbs/{name}", cache.path(name), manifest, stats)
+    cache.save()
+    log(f"[thumbs] {cache.stats}")
+
+# ---------- build ----------
+
+def build(results=None, consumer="build"):
+    """
+    results: 이미 받아 둔 [(url, not_modified, body)] (watch 모드). 없으면 여기서 받는다.
+    끝까지 성공하면 피드 본문을 consumer가 처리한 것으로 남긴다 (다음 빌드는 그 본문이면 건너뜀).
+    """
+    assert BASE_URL, "BASE_URL 환경변수를 설정하세요. 예: https://dorun092.github.io"
+    if results is None:
+        with metrics.span("fetch"):
+            results = fetch_all(RSS_URLS)
+    # 모든 피드가 304 + 이전 빌드 결과가 있으면 할 일 없음
+    if all(nm for _, nm, _ in results) and not FORCE_BUILD and (OUT_DIR / "index.html").exists():
+        log("[build] feed not modified, skip build")
+        return
+    # 아카이브(sqlite3)/썸네일/검색 색인 모듈은 실제로 빌드할 때만 import (304 빌드는 여기까지만)
+    from . import entry_store, search_index, thumbs
+    feed_entries = merge_entries([parse_feed(url, body) for url, _, body in results], None)
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    POSTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    # 피드 항목을 아카이브에 반영 → 사이트는 아카이브 전체에서 렌더링
+    store = entry_store.open_store()
+    changes = {"new": 0, "updated": 0}
+    with metrics.span("store"), store:
+        for e in feed_entries:
+            slug_base, post_id = slug_and_id(e)
+            key = to_mobile_naver_url(e.get("link", "")) or slug_base
+            r = entry_store.upsert(store, e, key, slug_base, post_id, entry_ts(e), thumbs.image_url(e))
+            if r:
+                changes[r] += 1
+    log(f"[store] total={entry_store.count(store)} new={changes['new']} updated={changes['updated']}")
+    metrics.incr("entries.new", changes["new"])
+    metrics.incr("entries.updated", changes["updated"])
+
+    manifest = load_manifest()
+    stats = {"written": 0, "skipped": 0, "removed": 0, "seen": set(), "writer": FileWriter(WRITE_WORKERS)}
+
+    entries = list(entry_store.iter_all(store))
+    if THUMBNAILS:
+        with metrics.span("thumbs"):
+            attach_thumbs(entries, manifest, stats)
+
+    # 항목별 로컬 페이지 생성
+    # 입력 해시가 그대로인 글은 렌더링하지 않는다 (FORCE_BUILD면 전부 다시 렌더링하고 결과 해시로만 비교)
+    # 렌더링은 프로세스 풀, 쓰기는 FileWriter 스레드 풀, 해시 비교/manifest 갱신은 여기서
+    item_pages = []  # (entry, "posts/slug.html", lastmod)
+    jobs = []        # 다시 렌더링할 글: (item_pages 번호, rel, entry, 입력 해시)
+    with metrics.span("render.items"):
+        for e in entries:
+            rel, key = f"posts/{e['slug']}.html", item_key(e)
+            lastmod = None if FORCE_BUILD else reuse(rel, key, manifest, stats)
+            if lastmod is None:
+                jobs.append((len(item_pages), rel, e, key))
+            item_pages.append((e, rel, lastmod))
+        for (k, rel, e, key), (_, text, h) in zip(jobs, render_all([(rel, e) for _, rel, e, _ in jobs])):
+            published = to_iso8601(e.get("published_parsed"))
+            item_pages[k] = (e, rel, emit(rel, text, manifest, stats, first_lastmod=published, h=h, key=key))
+    metrics.incr("items.rendered", len(jobs))
+    log(f"[render] items rendered={len(jobs)} reused={len(item_pages) - len(jobs)}")
+
+    with metrics.span("render.lists"):
+        # 목록 페이지: 1쪽은 index.html, 2쪽부터 page/N/index.html
+        total_pages = max(1, -(-len(item_pages) // PAGE_SIZE))
+        for n in range(1, total_pages + 1):
+            chunk = [(e, p) for e, p, _ in item_pages[(n - 1) * PAGE_SIZE:n * PAGE_SIZE]]
+            rel = "index.html" if n == 1 else f"page/{n}/index.html"
+            lastmod = emit(rel, render_index(chunk, f"{n}쪽" if n > 1 else "", render_pager(n, total_pages)), manifest, stats)
+            if n == 1:
+                index_lastmod = lastmod
+
+        # 월별 보관함: archive/YYYY/MM/index.html + archive/index.html
+        months = {}
+        for e, p, _ in item_pages:
+            t = e.get("published_parsed")
+            months.setdefault(f"{t.tm_year:04d}/{t.tm_mon:02d}" if t else "undated", []).append((e, p))
+        month_urls = []
+        for m, items in months.items():
+            lastmod = emit(f"archive/{m}/index.html", render_index(items, f"{m} 보관함", f'<a href="{BASE_URL}/archive/">월별 보관함</a>'), manifest, stats)
+            month_urls.append((f"{BASE_URL}/archive/{m}/", lastmod, "weekly", "0.5"))
+        emit("archive/index.html", render_archive_index([(m, len(items)) for m, items in months.items()]), manifest, stats)
+
+    # 검색 색인: 원문이 바뀐 글만 다시 토큰화하고, 건드린 shard 파일만 다시 쓴다
+    with metrics.span("search.index"):
+        index = search_index.SearchIndex(OUT_DIR / "search", text_limit=ITEM_SUMMARY_LIMIT)
+        for e, p, _ in item_pages:
+            index.update(e["id"], e.get("title", ""), e.get("summary", ""),
+                         [e.get("title", ""), p, to_iso8601(e.get("published_parsed"))[:10]])
+        index.prune()
+        index_files = []
+        for rel, text in index.files():
+            index_files.append(rel)
+            if text is None:
+                stats["seen"].add(rel)  # 그대로인 shard: 쓰지도 지우지도 않음
+            else:
+                emit(rel, text, manifest, stats)
+        emit("search.html", render_search_page(), manifest, stats)
+    log(f"[search] {index.stats()}")
+
+    with metrics.span("render.sitemaps"):
+        # sitemap: 홈/보관함은 sitemap-pages.xml, 글은 오래된 순으로 고정 크기 shard에 채운다
+        # (새 글은 마지막 shard에만 붙으므로 앞쪽 shard는 내용이 그대로 → emit이 건너뜀)
+        sitemaps = []
+        pages_urls = [(f"{BASE_URL}/", index_lastmod, "hourly", "1.0")] + month_urls
+        sitemaps.append((f"{BASE_URL}/sitemap-pages.xml", emit("sitemap-pages.xml", render_urlset(pages_urls), manifest, stats)))
+        oldest_first = item_pages[::-1]
+        for i in range(0, len(oldest_first), SITEMAP_SHARD_SIZE):
+            shard = oldest_first[i:i + SITEMAP_SHARD_SIZE]
+            rel = f"sitemap-{i // SITEMAP_SHARD_SIZE + 1}.xml"
+            urls = [(f"{BASE_URL}/{p}", lastmod, "daily", "0.8") for _, p, lastmod in shard]
+            sitemaps.append((f"{BASE_URL}/{rel}", emit(rel, render_urlset(urls), manifest, stats)))
+        sitemap_index = render_sitemap_index(sitemaps)
+        emit("sitemap-index.xml", sitemap_index, manifest, stats)
+        # 기존에 등록된 sitemap.xml 주소도 계속 유효하도록 같은 인덱스를 둔다
+        emit("sitemap.xml", sitemap_index, manifest, stats)
+
+        # robots.txt 생성 (sitemap 위치 알리기만)
+        emit("robots.txt", f"Sitemap: {BASE_URL}/sitemap-index.xml\n", manifest, stats)
+
+        emit("sitemap.html", textwrap.dedent(f"""\
+            <!doctype html><html><head>
+            <meta http-equiv="refresh" content="0; url={BASE_URL}/sitemap-index.xml">
+            <title>Sitemap Redirect</title>
+            </head><body>Redirecting to <a href="{BASE_URL}/sitemap-index.xml">sitemap-index.xml</a>...</body></html>
+        """), manifest, stats)
+
+    # 이번 빌드에서 만들지 않은 파일 정리 (아카이브를 지웠거나 쪽/shard 수가 줄어든 경우)
+    for rel in [r for r in manifest["pages"] if r not in stats["seen"]]:
+        (OUT_DIR / rel).unlink(missing_ok=True)
+        del manifest["pages"][rel]
+        stats["removed"] += 1
+
+    with metrics.span("write.flush"):
+        stats["writer"].close()
+        save_manifest(manifest)
+        index.save(index_files)
+    store.close()
+    for k in ("written", "skipped", "removed"):
+        metrics.incr(f"files.{k}", stats[k])
+    log(f"[build] written={stats['written']} skipped={stats['skipped']} removed={stats['removed']}")
+    if consumer:
+        # 실패한 빌드는 여기까지 오지 않음 → 다음 빌드가 같은 본문을 다시 처리한다
+        for url, _, body in results:
+            if body is not None:
+                feed_cache.mark_handled(url, consumer, feed_cache.digest(body))
+
+def run(args):
+    build()
@@ -0,0 +1,54 @@
+import sys, argparse, importlib
+from . import metrics
+
+# 하위 명령 → 실행 모듈. 옵션은 여기서만 정의하고 모듈은 파싱이 끝난 뒤 import 한다
+# → --help나 304로 끝나는 실행은 requests/feedparser/dateutil 을 불러오지 않는다.
+COMMANDS = {"build": ".build", "post": ".post", "backfill": ".backfill", "watch": ".watch"}
+
+def _date(s):
+    from .backfill import parse_date
+    return parse_date(s)
+
+def parser():
+    p = argparse.ArgumentParser(prog="nblog", description="Naver blog RSS mirror / Blogger publisher")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--profile", metavar="PATH", help="cProfile 통계를 PATH에 저장")
+
+    sub.add_parser("build", parents=[common], help="Build the static mirror site from RSS")
+    sub.add_parser("post", parents=[common], help="Post the newest Naver RSS entries to Blogger")
+
+    b = sub.add_parser("backfill", parents=[common], help="Backfill old posts from Naver RSS to Blogger")
+    b.add_argument("--max", type=int, default=None, help="올릴 최대 개수")
+    b.add_argument("--skip", type=int, default=0, help="앞에서 N개 건너뛰기")
+    b.add_argument("--since", type=_date, help="이 날짜(포함) 이후 (YYYY-MM-DD)")
+    b.add_argument("--until", type=_date, help="이 날짜(포함) 이전 (YYYY-MM-DD)")
+    b.add_argument("--oldest-first", action="store_true", help="오래된 것부터 업로드")
+    b.add_argument("--force", action="store_true", help="이미 올린 글이라도 다시 업로드")
+    b.add_argument("--sync", action="store_true", help="장부에 있는 글은 제목/요약이 바뀐 경우에만 기존 글을 PATCH")
+    b.add_argument("--dry-run", action="store_true", help="실제 업로드 없이 계획만")
+    b.add_argument("--workers", type=int, default=4, help="동시 발행 워커 수 (--oldest-first면 1)")
+    b.add_argument("--rate", type=float, default=0.5, help="초당 쓰기(insert/patch) 호출 수 상한. 검색은 제한 없음, 처음 --workers건은 바로")
+    b.add_argument("--max-retries", type=int, default=5, help="429/5xx 재시도 횟수")
+    b.add_argument("--stream", action="store_true", help="feedparser 대신 스트리밍 파서 사용 (대용량 아카이브용)")
+    b.add_argument("--snapshot", action="store_true", help="posts.list로 원격 글 목록을 먼저 받아 중복 체크 (search 호출 없음)")
+    b.add_argument("--ledger", default=None, help="발행 장부(SQLite) 경로 (기본 PUBLISH_LEDGER), 빈 문자열이면 사용 안 함")
+    b.add_argument("--job", help="작업 저널 이름 (기본: 시작 시각)")
+    b.add_argument("--batch", type=int, default=0, metavar="N", help="검색/발행 호출을 N개씩 multipart 배치 요청으로 (0/1이면 단건)")
+    b.add_argument("--resume", metavar="JOB", help="저널에 남은 작업 이어서 하기 (피드/선택 옵션 무시)")
+
+    w = sub.add_parser("watch", parents=[common], help="Poll RSS and build/post only when it changes")
+    w.add_argument("--min-interval", type=float, default=60, help="폴링 간격 하한(초), 새 글 직후 간격")
+    w.add_argument("--max-interval", type=float, default=1800, help="폴링 간격 상한(초)")
+    w.add_argument("--no-build", action="store_true", help="미러 사이트 빌드 안 함")
+    w.add_argument("--no-post", action="store_true", help="Blogger 발행 안 함")
+    w.add_argument("--cycles", type=int, default=0, help="N번 확인하고 종료 (0이면 계속)")
+    return p
+
+def main(argv=None):
+    args = parser().parse_args(sys.argv[1:] if argv is None else argv)
+    metrics.start(args.command)
+    mod = importlib.import_module(COMMANDS[args.command], __package__)
+    with metrics.profiled(args.profile):
+        mod.run(args)
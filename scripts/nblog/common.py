@@ -0,0 +1,182 @@
+import os, re, html, textwrap
+from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+from .metrics import log
+from .html_text import html_to_text
+
+# post / backfill 공용: 환경변수, Blogger 클라이언트, 원문 링크 식별, 본문 렌더링, 중복 확인
+#
+# 예전에는 두 스크립트가 요약 길이·본문 템플릿·중복 확인 방식을 제각각 갖고 있었다.
+# (post 쪽 본문엔 source marker가 없어 backfill이 같은 글을 못 알아봄)
+# requests 같은 무거운 모듈은 실제로 API를 부를 때만 import 한다.
+
+DEFAULT_RSS_URL = "https://rss.blog.naver.com/do_run_.xml"
+BLOGGER_API = os.environ.get("BLOGGER_API", "https://www.googleapis.com/blogger/v3")
+# multipart 배치 엔드포인트 (…/blogger/v3 → …/batch/blogger/v3)
+BATCH_API = os.environ.get("BLOGGER_BATCH_API") or BLOGGER_API.rsplit("/blogger/", 1)[0] + "/batch/blogger/v3"
+REQUIRED_ENV = ("GCP_CLIENT_ID", "GCP_CLIENT_SECRET", "GCP_REFRESH_TOKEN", "BLOG_ID")
+SUMMARY_LIMIT = 400
+
+MARKER_RE = re.compile(r"<!--\s*(source:nblog:[^\s]+)\s*-->")
+HREF_RE   = re.compile(r'href="([^"]+)"')
+
+# ---------- env / client ----------
+
+def rss_urls():
+    """RSS_URL을 쉼표/공백으로 나눈 피드 목록. build/watch/post는 여러 피드를 최신순으로 합친다."""
+    return [u for u in re.split(r"[\s,]+", os.environ.get("RSS_URL", DEFAULT_RSS_URL)) if u]
+
+def rss_url(command):
+    """피드 하나만 다루는 명령(backfill)용. 여러 개면 명령 이름과 함께 종료."""
+    urls = rss_urls()
+    if len(urls) != 1:
+        raise SystemExit(f"{command}: RSS_URL에는 피드 하나만 넣으세요 (받은 값 {len(urls)}개: {', '.join(urls) or '없음'}). "
+                         f"피드마다 RSS_URL=... 로 따로 실행합니다")
+    return urls[0]
+
+def require_env():
+    """필수 env 확인 후 BLOG_ID. import 시점이 아니라 실제 실행할 때 읽는다."""
+    missing = [k for k in REQUIRED_ENV if not os.environ.get(k)]
+    if missing:
+        raise SystemExit("Missing env: " + ", ".join(missing))
+    return os.environ["BLOG_ID"]
+
+def get_client(pool_size=10, eager=True):
+    """BloggerClient 생성. eager면 토큰을 바로 받아 실패를 일찍 알린다."""
+    import requests
+    from .blogger_client import BloggerClient
+    client = BloggerClient(os.environ["GCP_CLIENT_ID"], os.environ["GCP_CLIENT_SECRET"],
+                           os.environ["GCP_REFRESH_TOKEN"], pool_size=pool_size)
+    if eager:
+        try:
+            client.access_token()
+        except requests.HTTPError as e:
+            raise SystemExit(f"[token] fail {e.response.status_code} {e.response.text}")
+        log("[ok] access_token issued")
+    return client
+
+# ---------- 원문 링크 식별 ----------
+
+def link_keys(link: str):
+    """(네이버 글ID, query/fragment를 뗀 링크). PostView.nhn?blogId=a&logNo=b 는 /a/b 로 바꾼다."""
+    p = urlparse(link or "")
+    qs = parse_qs(p.query or "")
+    blog_id = (qs.get("blogId") or qs.get("blogid") or [""])[0]
+    log_no = (qs.get("logNo") or qs.get("logno") or [""])[0]
+    if blog_id and log_no:
+        p = p._replace(path=f"/{blog_id}/{log_no}")
+    base = urlunparse(p._replace(query="", fragment=""))
+    post_id = base.split("/")[-1] if "/" in base else base
+    return post_id, base
+
+def normalize_link(u: str) -> str:
+    return link_keys(u)[1] if u else u
+
+def source_marker(link: str) -> str:
+    # 네이버 글ID로 숨김 마커 생성 (장부 키와 같은 값)
+    return f"source:nblog:{link_keys(link)[0]}"
+
+# ---------- 본문 ----------
+
+def summarize(text, limit=SUMMARY_LIMIT):
+    # 네이버 요약은 HTML 조각 → 태그를 벗긴 텍스트로 (limit에서 파싱 중단)
+    return html_to_text(text, limit)
+
+def render_content(title, link, summary):
+    # Blogger 본문용 간단 템플릿 (마커 + 요약 + 원문 링크)
+    return textwrap.dedent(f"""
+        <!-- {source_marker(link)} -->
+        <p><strong>{html.escape(title)}</strong></p>
+        <p>{html.escape(summary)}</p>
+        <p>👉 <a href="{html.escape(normalize_link(link))}" rel="nofollow noopener" target="_blank">원문 보기(네이버 블로그)</a></p>
+        <hr/>
+        <p style="color:#888;font-size:0.9em">본 포스트는 RSS 자동화로 발행되었습니다.</p>
+    """).strip()
+
+# ---------- 중복 확인 ----------
+
+def fetch_remote_snapshot(client, blog_id):
+    """
+    posts.list를 페이지 단위(500개)로 훑어 이미 올라간 글의 마커/링크 집합을 만든다.
+    본문에서 마커와 href만 뽑고 나머지는 버림 → 글 N개당 search 2회 대신 N/500회 list 호출.
+    """
+    url = f"{BLOGGER_API}/blogs/{blog_id}/posts"
+    params = {
+        "maxResults": 500,
+        "fetchBodies": "true",
+        "fetchImages": "false",
+        "status": ["live", "draft", "scheduled"],
+        "fields": "nextPageToken,items(id,url,content)",
+    }
+    # 마커/링크 → (blogger id, url)
+    markers, links, pages = {}, {}, 0
+    while True:
+        js = client.get(url, params=params)
+        pages += 1
+        for it in js.get("items") or []:
+            body = it.get("content") or ""
+            ref = (it.get("id"), it.get("url"))
+            for m in MARKER_RE.findall(body):
+                markers[m] = ref
+            for h in HREF_RE.findall(body):
+                links[normalize_link(html.unescape(h))] = ref
+        token = js.get("nextPageToken")
+        if not token:
+            break
+        params["pageToken"] = token
+    log(f"[snapshot] pages={pages} markers={len(markers)} links={len(links)}")
+    return {"markers": markers, "links": links}
+
+def already_posted(client, blog_id, link, ledger=None, snapshot=None):
+    from .publish_ledger import ledger_lookup, ledger_record
+    # 0차: 로컬 발행 장부 (API 호출 없음)
+    if ledger_lookup(ledger, link):
+        return True
+    # 스냅샷이 있으면 그것만으로 판정 (마커 정확 일치)
+    if snapshot is not None:
+        ref = snapshot["markers"].get(source_marker(link)) or snapshot["links"].get(normalize_link(link))
+        if ref:
+            ledger_record(ledger, link, *ref)
+        return ref is not None
+    # 1차: 마커 검색
+    url = f"{BLOGGER_API}/blogs/{blog_id}/posts/search"
+    js = client.get(url, params={"q": f'"{source_marker(link)}"'})
+    if not js.get("items"):
+        # 2차: 링크 문자열 검색 (마커 없이 올라간 예전 글)
+        js = client.get(url, params={"q": f'"{normalize_link(link)}"'})
+    items = js.get("items") or []
+    if items:
+        # 원격에서 찾았으면 장부에도 남겨 다음 실행부터는 검색 생략
+        ledger_record(ledger, link, items[0].get("id"), items[0].get("url"))
+    return bool(items)
+
+def already_posted_many(client, blog_id, links, ledger=None, snapshot=None, size=50, **retry):
+    """
+    여러 링크의 already_posted를 한 번에. 장부/스냅샷으로 판정 못 한 링크만 posts.search를
+    size개씩 배치 요청으로 (마커 검색 → 안 나온 것만 링크 검색). ({link: bool}, {link: 예외})
+    retry는 publisher.batch_all 인자 (max_retries, log …). 속도 제한은 client.limiter.
+    """
+    from .publish_ledger import ledger_lookup, ledger_record
+    from .publisher import batch_all
+    found, errors, remote = {}, {}, []
+    for link in dict.fromkeys(links):
+        if ledger_lookup(ledger, link) or snapshot is not None:
+            found[link] = already_posted(client, blog_id, link, ledger, snapshot)
+        else:
+            remote.append(link)
+    url = f"{BLOGGER_API}/blogs/{blog_id}/posts/search?"
+    for key in (source_marker, normalize_link):
+        if not remote:
+            break
+        results = batch_all(remote, lambda l: ("GET", url + urlencode({"q": f'"{key(l)}"'}), None),
+                            lambda l, js: js.get("items") or [], client, BATCH_API, size=size, **retry)
+        remote = []
+        for link, items, err in results:
+            if err is not None:
+                errors[link] = err
+            elif items:
+                ledger_record(ledger, link, items[0].get("id"), items[0].get("url"))
+                found[link] = True
+            else:
+                remote.append(link)
+    found.update(dict.fromkeys(remote, False))
+    return found, errors
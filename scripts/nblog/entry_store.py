@@ -0,0 +1,86 @@
+import os, sqlite3, pathlib, time
+from datetime import datetime, timezone
+
+# 항목 아카이브 (build 전용)
+#
+# 네이버 RSS는 최근 글만 주기 때문에, 매 빌드마다 피드 항목을 여기에 upsert 해 두고
+# 사이트(목록/개별 페이지/sitemap)는 이 저장소에서 렌더링한다.
+# 한 번 본 글은 피드에서 빠져도 남고, slug도 처음 배정된 값이 고정된다.
+
+ENTRY_STORE = os.environ.get("ENTRY_STORE", ".cache/entries.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id           INTEGER PRIMARY KEY,
+    key          TEXT NOT NULL UNIQUE,   -- 정규화 링크
+    post_id      TEXT,                   -- 네이버 logNo 등 숫자 ID
+    slug         TEXT NOT NULL UNIQUE,
+    link         TEXT,
+    title        TEXT,
+    summary      TEXT,
+    published    TEXT,
+    published_ts INTEGER NOT NULL DEFAULT 0,
+    image        TEXT,                   -- 첫 이미지 주소 (썸네일 미러용)
+    first_seen   TEXT NOT NULL,
+    updated_at   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_published ON entries(published_ts DESC, id DESC);
+CREATE INDEX IF NOT EXISTS entries_post_id ON entries(post_id);
+"""
+
+_COLS = "id, key, post_id, slug, link, title, summary, published, published_ts, image"
+
+def open_store(path=ENTRY_STORE):
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(_SCHEMA)
+    # 예전 아카이브에는 image 컬럼이 없다 → 추가만 (기존 행은 NULL, 다음에 피드에서 보이면 채워진다)
+    cols = {row[1] for row in db.execute("PRAGMA table_info(entries)")}
+    if "image" not in cols:
+        db.execute("ALTER TABLE entries ADD COLUMN image TEXT")
+        db.commit()
+    return db
+
+def _row_to_entry(row):
+    e = dict(zip(("id", "key", "post_id", "slug", "link", "title", "summary", "published", "published_ts", "image"), row))
+    # feedparser 항목과 같은 모양으로 (렌더러가 그대로 쓰도록)
+    e["published_parsed"] = time.gmtime(e["published_ts"]) if e["published_ts"] else None
+    return e
+
+def _unique_slug(db, base):
+    slug, i = base, 2
+    while db.execute("SELECT 1 FROM entries WHERE slug = ?", (slug,)).fetchone():
+        slug = f"{base}-{i}"
+        i += 1
+    return slug
+
+def upsert(db, e, key, slug_base, post_id, published_ts, image=None):
+    """새 글이면 slug를 배정해 추가, 있던 글이면 제목/요약/날짜/이미지가 바뀐 경우만 갱신. 'new'|'updated'|None."""
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    title = e.get("title", "")
+    summary = e.get("summary", "") or e.get("description", "") or ""
+    published = e.get("published", "") or e.get("updated", "")
+    row = db.execute("SELECT title, summary, published, image FROM entries WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        db.execute(
+            "INSERT INTO entries (key, post_id, slug, link, title, summary, published, published_ts, image, first_seen, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, post_id, _unique_slug(db, slug_base), e.get("link", ""), title, summary, published, published_ts, image, now, now),
+        )
+        return "new"
+    if row != (title, summary, published, image):
+        db.execute(
+            "UPDATE entries SET title = ?, summary = ?, published = ?, published_ts = ?, link = ?, image = ?, updated_at = ? WHERE key = ?",
+            (title, summary, published, published_ts, e.get("link", ""), image, now, key),
+        )
+        return "updated"
+    return None
+
+def iter_all(db):
+    """전체 항목을 최신순으로 하나씩 (published_ts 인덱스 순서).
+    build는 목록 첫 쪽만이 아니라 개별 페이지/보관함/sitemap/검색 색인까지 아카이브 전체를 렌더링한다."""
+    for r in db.execute(f"SELECT {_COLS} FROM entries ORDER BY published_ts DESC, id DESC"):
+        yield _row_to_entry(r)
+
+def count(db):
+    return db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
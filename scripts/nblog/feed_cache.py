@@ -0,0 +1,128 @@
+import os, json, time, hashlib, pathlib, urllib.request, urllib.error
+from collections import namedtuple
+from . import metrics
+
+# 조건부 GET 피드 캐시 (build / post / backfill 공용)
+#
+# - 원본 바이트와 ETag/Last-Modified 를 디스크에 저장
+# - 다음 요청에 If-None-Match / If-Modified-Since 를 실어 보내고
+#   304면 저장된 본문을 그대로 쓴다 (not_modified=True)
+# - 전체 요청에 하드 타임아웃(FEED_TIMEOUT초) 적용
+# - ETag/304 는 명령들이 같이 쓰지만 "이미 처리했다"는 명령(consumer)마다 따로 둔다:
+#   fetch_feed(url, consumer=…) 는 그 명령이 마지막으로 처리한 본문 해시와 같을 때만 not_modified.
+#   처리를 끝낸 명령이 mark_handled 로 해시를 남긴다 (실패한 실행은 남기지 않음 → 다음에 다시)
+#   → build 가 먼저 200을 받아도 post 는 새 본문을 처리한다
+
+FEED_CACHE_DIR = os.environ.get("FEED_CACHE_DIR", ".cache/feed")
+FEED_TIMEOUT   = float(os.environ.get("FEED_TIMEOUT", "20"))
+USER_AGENT     = "nblog-mirror/1.0 (+https://github.com/dorun092)"
+
+FeedFetch = namedtuple("FeedFetch", "path not_modified digest", defaults=(None,))
+
+def _paths(url, cache_dir):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    d = pathlib.Path(cache_dir)
+    return d / f"{key}.xml", d / f"{key}.json"
+
+def _load_meta(meta_path):
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _handled_path(url, consumer, cache_dir):
+    return _paths(url, cache_dir)[0].with_suffix(f".{consumer}.handled")
+
+def digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+def mark_handled(url, consumer, body_digest, cache_dir=FEED_CACHE_DIR):
+    """consumer가 이 본문을 끝까지 처리했다고 기록 (다음 fetch_feed(consumer=…)의 not_modified 기준)."""
+    if not url.startswith(("http://", "https://")) or not body_digest:
+        return
+    path = _handled_path(url, consumer, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body_digest, encoding="utf-8")
+
+def fetch_feed(url, cache_dir=FEED_CACHE_DIR, timeout=FEED_TIMEOUT, consumer=None):
+    """
+    피드를 받아 캐시에 저장하고 FeedFetch(path, not_modified, digest)를 돌려준다.
+    consumer가 없으면 not_modified는 HTTP 304 여부, 있으면 그 명령이 이 본문을 이미 처리했는지.
+    http(s)가 아닌 값은 로컬 파일 경로로 보고 그대로 돌려준다.
+    """
+    if not url.startswith(("http://", "https://")):
+        return FeedFetch(pathlib.Path(url), False)
+
+    body_path, meta_path = _paths(url, cache_dir)
+    body_path.parent.mkdir(parents=True, exist_ok=True)
+    meta = _load_meta(meta_path) if body_path.exists() else {}
+
+    headers = {"User-Agent": USER_AGENT}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    with metrics.span("feed.download"):
+        res = _download(url, headers, body_path, meta_path, timeout)
+    if consumer is None:
+        return res
+    d = digest(res.path.read_bytes())
+    try:
+        handled = _handled_path(url, consumer, cache_dir).read_text(encoding="utf-8")
+    except OSError:
+        handled = None
+    return FeedFetch(res.path, handled == d, d)
+
+def _download(url, headers, body_path, meta_path, timeout):
+    deadline = time.monotonic() + timeout
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        resp = urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        metrics.http("feed", e.code)
+        if e.code == 304 and body_path.exists():
+            return FeedFetch(body_path, True)
+        raise
+
+    # 본문은 조각 단위로 임시파일에 쓰고, 전체 소요시간이 deadline을 넘으면 중단.
+    # read1은 64KB를 다 채울 때까지 기다리지 않고, 소켓 타임아웃은 남은 시간으로 줄여 가며 읽는다
+    # → 조금씩 천천히 보내는 서버도 deadline에서 끊긴다
+    tmp = body_path.with_suffix(".part")
+    sock = getattr(getattr(resp.fp, "raw", None), "_sock", None)
+    size = 0
+    with resp, open(tmp, "wb") as f:
+        while True:
+            left = deadline - time.monotonic()
+            try:
+                if left <= 0:
+                    raise TimeoutError
+                if sock is not None:
+                    sock.settimeout(left)
+                chunk = resp.read1(64 * 1024)
+            except (TimeoutError, OSError) as exc:
+                tmp.unlink(missing_ok=True)
+                if left <= 0 or isinstance(exc, TimeoutError):
+                    raise TimeoutError(f"feed download exceeded {timeout}s: {url}") from None
+                raise
+            if not chunk:
+                break
+            f.write(chunk)
+            size += len(chunk)
+        new_meta = {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": int(time.time()),
+        }
+    os.replace(tmp, body_path)
+    meta_path.write_text(json.dumps(new_meta), encoding="utf-8")
+    metrics.http("feed", resp.status, size)
+    return FeedFetch(body_path, False)
+
+def cached_copy(url, cache_dir=FEED_CACHE_DIR):
+    """마지막으로 성공한 본문 경로 (없으면 None). 네트워크 실패 시 폴백용."""
+    if not url.startswith(("http://", "https://")):
+        return None
+    body_path, _ = _paths(url, cache_dir)
+    return body_path if body_path.exists() else None
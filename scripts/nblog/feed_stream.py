@@ -0,0 +1,75 @@
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+# 스트리밍 피드 파서
+#
+# feedparser는 피드 전체를 dict 트리로 만든 뒤 돌려주므로 수만 건짜리 아카이브에선
+# 메모리/시간이 크다. 여기서는 iterparse로 <item>/<entry>가 끝날 때마다 가벼운 dict
+# 하나를 yield 하고 해당 XML 노드를 바로 버려서, 피드 크기와 무관하게 메모리가 평평하다.
+#
+# 돌려주는 dict 키는 feedparser 항목과 같은 이름(title/link/summary/published/
+# published_parsed)이라 기존 코드의 e.get(...)을 그대로 쓸 수 있다.
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def _parse_date(s):
+    if not s:
+        return None
+    s = s.strip()
+    try:
+        dt = parsedate_to_datetime(s)        # RSS: RFC 822
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))  # Atom: RFC 3339
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).timetuple()
+
+def _record(el):
+    e = {}
+    for child in el:
+        name = _local(child.tag)
+        text = (child.text or "").strip()
+        if name == "title":
+            e["title"] = text
+        elif name == "link":
+            # Atom: <link rel="alternate" href="..."/>
+            href = child.get("href")
+            if href is None:
+                e["link"] = text
+            elif child.get("rel", "alternate") == "alternate":
+                e["link"] = href
+        elif name in ("description", "summary") and "summary" not in e:
+            e["summary"] = text
+        elif name in ("encoded", "content"):
+            e.setdefault("summary", text)
+        elif name in ("pubDate", "published"):
+            e["published"] = text
+        elif name == "updated":
+            e["updated"] = text
+        elif name in ("guid", "id"):
+            e["id"] = text
+    if "published" in e:
+        e["published_parsed"] = _parse_date(e["published"])
+    if "updated" in e:
+        e["updated_parsed"] = _parse_date(e["updated"])
+    return e
+
+def iter_entries(source):
+    """source(파일 경로/파일 객체)에서 RSS <item> 또는 Atom <entry>를 하나씩 dict로 yield."""
+    stack = []
+    for event, el in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(el)
+            continue
+        stack.pop()
+        if _local(el.tag) in ("item", "entry"):
+            yield _record(el)
+            # 처리 끝난 노드는 부모에서 떼어내 트리가 자라지 않게 한다
+            if stack:
+                stack[-1].remove(el)
+            el.clear()
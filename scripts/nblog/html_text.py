@@ -0,0 +1,95 @@
+import re, unicodedata
+from html.parser import HTMLParser
+
+# 피드 요약 HTML → 일반 텍스트 (한 번 훑기)
+#
+# - 태그는 버리고 script/style 등은 내용까지 버린다. 블록 태그 경계는 공백 하나로
+# - 공백은 흘려보내면서 바로 하나로 접는다
+# - limit가 있으면 글자가 limit를 넘는 순간 파싱을 멈춘다 (긴 본문 전체를 훑지 않음)
+# - 자를 때는 결합 문자/ZWJ 이모지/조합형 한글 자모 중간에서 끊지 않는다
+
+WS_RE = re.compile(r"\s+")
+SKIP_TAGS = {"script", "style", "noscript", "template", "head", "title", "svg", "iframe", "object"}
+BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "tr", "td", "th", "table", "section", "article",
+              "blockquote", "pre", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "figure", "figcaption"}
+CHUNK = 2048
+ELLIPSIS = "…"
+
+class _Extractor(HTMLParser):
+    def __init__(self, limit):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.parts = []
+        self.size = 0
+        self.skip = 0
+        self.space = False   # 다음 글자 앞에 공백이 필요한가
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag in BLOCK_TAGS:
+            self.space = True
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.space = True
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif tag in BLOCK_TAGS:
+            self.space = True
+
+    def handle_data(self, data):
+        if self.skip or self.done:
+            return
+        t = WS_RE.sub(" ", data)
+        if t[:1] == " ":
+            self.space = True
+        t = t.strip()
+        if not t:
+            return
+        if self.space and self.parts:
+            self.parts.append(" ")
+            self.size += 1
+        self.parts.append(t)
+        self.size += len(t)
+        self.space = data[-1:].isspace()
+        # 잘릴 자리 뒤 글자까지 봐야 결합 문자 여부를 알 수 있어 limit보다 한 글자 더 모은다
+        if self.limit is not None and self.size > self.limit:
+            self.done = True
+
+def _continues(ch):
+    """앞 글자와 한 덩어리(grapheme)로 붙는 글자인가."""
+    o = ord(ch)
+    return (unicodedata.combining(ch) or unicodedata.category(ch) in ("Mn", "Me", "Mc")
+            or o == 0x200D                                   # ZWJ
+            or 0xFE00 <= o <= 0xFE0F or 0xE0100 <= o <= 0xE01EF  # variation selector
+            or 0x1F3FB <= o <= 0x1F3FF                       # 피부색 수식자
+            or 0x1160 <= o <= 0x11FF or 0xD7B0 <= o <= 0xD7FF)   # 한글 중성/종성 자모
+
+def cut(text, limit):
+    """text를 limit 글자 이하로, 글자 덩어리 경계에서 자른다."""
+    if len(text) <= limit:
+        return text
+    i = limit
+    while i > 0 and (_continues(text[i]) or text[i - 1] == "\u200d"):
+        i -= 1
+    return text[:i]
+
+def html_to_text(markup, limit=None):
+    """HTML 조각 → 공백이 정리된 텍스트. limit를 넘으면 잘라서 끝에 …"""
+    if not markup:
+        return ""
+    p = _Extractor(limit)
+    for i in range(0, len(markup), CHUNK):
+        p.feed(markup[i:i + CHUNK])
+        if p.done:
+            break
+    else:
+        p.close()
+    text = "".join(p.parts)
+    if limit is not None and len(text) > limit:
+        return cut(text, limit).rstrip() + ELLIPSIS
+    return text
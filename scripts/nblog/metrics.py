@@ -0,0 +1,83 @@
+import os, sys, json, time, atexit, threading, contextlib
+from collections import Counter
+
+# 실행 계측 (build / post / backfill 공용)
+#
+# - span(name): 구간별 소요 시간 (횟수/합계/최대). 워커 스레드의 span은 합산되므로 wall보다 클 수 있다
+# - incr(name): 카운터 (HTTP 엔드포인트·상태별 호출, 다운로드 바이트, 항목 처리 결과, 쓴 파일, 재시도 …)
+# - start(script): 종료 시 한 줄짜리 JSON 요약을 "[metrics] {...}" 로 출력 (METRICS_FILE 지정 시 파일에도)
+# - profiled(path): --profile 용 cProfile 래퍼
+
+METRICS_FILE = os.environ.get("METRICS_FILE", "")
+
+_lock = threading.Lock()
+_counters = Counter()
+_spans = {}
+_state = {"script": None, "t0": time.perf_counter()}
+
+def log(*a):
+    print(*a, flush=True)
+
+def incr(name, n=1):
+    with _lock:
+        _counters[name] += n
+
+def http(endpoint, status, nbytes=0):
+    """HTTP 호출 1건 기록: http.<endpoint>.<status> (+ 받은 바이트)."""
+    with _lock:
+        _counters[f"http.{endpoint}.{status}"] += 1
+        if nbytes:
+            _counters["bytes.downloaded"] += nbytes
+
+@contextlib.contextmanager
+def span(name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        with _lock:
+            s = _spans.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            s["count"] += 1
+            s["total_s"] += dt
+            s["max_s"] = max(s["max_s"], dt)
+
+def summary():
+    with _lock:
+        return {
+            "script": _state["script"],
+            "wall_s": round(time.perf_counter() - _state["t0"], 3),
+            "spans": {k: {"count": v["count"], "total_s": round(v["total_s"], 3), "max_s": round(v["max_s"], 3)}
+                      for k, v in _spans.items()},
+            "counters": dict(sorted(_counters.items())),
+        }
+
+def emit_summary():
+    text = json.dumps(summary(), ensure_ascii=False)
+    print("[metrics] " + text, flush=True)
+    if METRICS_FILE:
+        with open(METRICS_FILE, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+def start(script):
+    """실행 시작 시 한 번 호출. 종료(예외 포함) 때 요약을 남긴다."""
+    if _state["script"] is None:
+        atexit.register(emit_summary)
+    _state["script"] = script
+    _state["t0"] = time.perf_counter()
+
+@contextlib.contextmanager
+def profiled(path):
+    """path가 있으면 블록 전체를 cProfile로 돌려 path에 저장하고 누적 상위 25개를 stderr로."""
+    if not path:
+        yield
+        return
+    import cProfile, pstats
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(path)
+        pstats.Stats(prof, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
@@ -0,0 +1,164 @@
+import os
+from . import metrics, feed_cache
+from .metrics import log
+from .common import (BLOGGER_API, BATCH_API, rss_urls, require_env, get_client, summarize, render_content,
+                     already_posted, already_posted_many)
+
+# 최신 글 N개를 Blogger로 발행 (cron용)
+#
+# post가 이미 처리한 피드 본문이면(보통 304) feedparser/requests/sqlite 를 불러오지도 않고 끝난다.
+# RSS_URL에 피드가 여러 개면 바뀐 피드들을 최신순으로 합쳐 상위 MAX_POSTS개 (watch와 같음).
+
+def settings():
+    return {
+        "max_posts": int(os.environ.get("MAX_POSTS", "1")),                     # 한번에 올릴 개수(기본 1개)
+        "dry_run": os.environ.get("DRY_RUN", "false").lower() == "true",        # true면 실제 업로드 X
+        "sync_edits": os.environ.get("SYNC_EDITS", "false").lower() == "true",  # true면 수정된 원문을 기존 글에 반영
+        "batch": int(os.environ.get("BLOGGER_BATCH", "0")),                     # 2 이상이면 검색/발행을 N개씩 배치 요청으로
+    }
+
+def fetch_feed(url):
+    """조건부 GET. post가 이미 처리한 본문이면 None, 아니면 (최신순 항목, 본문 해시)."""
+    res = feed_cache.fetch_feed(url, consumer="post")
+    if res.not_modified:
+        return None
+    from .build import parse_feed
+    return parse_feed(url, res.path.read_bytes()), res.digest
+
+def main(args=None):
+    blog_id = require_env()
+    cfg = settings()
+    # 토큰 발급보다 먼저 피드 확인: 바뀐 게 없으면 API 호출 없이 종료
+    changed = []
+    for url in rss_urls():
+        fetched = fetch_feed(url)
+        if fetched is not None:
+            changed.append((url, *fetched))
+    if not changed:
+        log("[info] feed not modified, nothing to post")
+        return
+    from .build import merge_entries
+    publish(merge_entries([entries for _, entries, _ in changed], None), get_client(), blog_id, cfg)
+    # 여기까지 성공했을 때만 처리 완료로 남긴다 (실패하면 다음 실행이 같은 본문을 다시 처리)
+    for url, _, body_digest in changed:
+        feed_cache.mark_handled(url, "post", body_digest)
+
+def publish(entries, client, blog_id, cfg):
+    """피드 항목(최신순) 중 상위 max_posts개를 발행/수정. watch 모드는 같은 client를 계속 넘긴다."""
+    from .publish_ledger import open_ledger, ledger_lookup, ledger_record, content_hash
+    if not entries:
+        log("[info] no entries in RSS")
+        return
+
+    # 최신순으로 상위 N개만
+    to_publish = entries[:cfg["max_posts"]]
+    metrics.incr("entries.candidates", len(to_publish))
+    posted = 0
+    ledger = open_ledger()
+    batching = cfg["batch"] > 1
+    calls = []  # 배치 모드: (title, link, h, 장부 행, (method, url, body))
+    found, errors = {}, {}
+    if batching:
+        with metrics.span("dedupe"):
+            found, errors = already_posted_many(client, blog_id, [e.get("link") for e in to_publish if e.get("link")],
+                                                ledger, size=cfg["batch"], log=log)
+
+    for e in to_publish:
+        title = e.get("title") or "(제목 없음)"
+        link  = e.get("link")  or ""
+        summary = summarize(e.get("summary") or e.get("description") or "")
+
+        if not link:
+            log(f"[skip] no link for '{title}'")
+            metrics.incr("entries.no_link")
+            continue
+
+        h = content_hash(title, summary)
+        row = ledger_lookup(ledger, link) if cfg["sync_edits"] else None
+        if row and row["blogger_id"]:
+            # 이미 올린 글: 제목/요약이 바뀌었을 때만 PATCH (해시 없는 예전 기록은 지금 내용을 기준으로 저장)
+            if row["content_hash"] == h:
+                metrics.incr("entries.unchanged")
+            elif row["content_hash"] is None:
+                ledger_record(ledger, link, content_hash=h)
+                metrics.incr("entries.baselined")
+            elif cfg["dry_run"]:
+                log("[dry-run] would update post:", title)
+                metrics.incr("entries.dry_run")
+            else:
+                url = f"{BLOGGER_API}/blogs/{blog_id}/posts/{row['blogger_id']}"
+                body = {"title": title, "content": render_content(title, link, summary)}
+                if batching:
+                    calls.append((title, link, h, row, ("PATCH", url, body)))
+                    continue
+                with metrics.span("publish"):
+                    res = client.patch(url, body)
+                log(f"[updated] {res.get('url') or row['url']}")
+                metrics.incr("entries.updated")
+                ledger_record(ledger, link, res.get("id"), res.get("url"), h)
+            continue
+
+        # 중복 체크
+        if link in errors:
+            raise errors[link]
+        with metrics.span("dedupe"):
+            exists = found[link] if link in found else already_posted(client, blog_id, link, ledger)
+        if exists:
+            log(f"[skip] already posted: {link}")
+            metrics.incr("entries.exists")
+            continue
+
+        body = {
+            "kind": "blogger#post",
+            "title": title,
+            "content": render_content(title, link, summary),
+            # 라벨(카테고리) 사용하고 싶으면 여기 추가
+            # "labels": ["네이버요약", "자동포스팅"]
+        }
+
+        if cfg["dry_run"]:
+            log("[dry-run] would create post:", title)
+            metrics.incr("entries.dry_run")
+            posted += 1
+        elif batching:
+            if any(c[1] == link for c in calls):
+                continue
+            calls.append((title, link, h, None, ("POST", f"{BLOGGER_API}/blogs/{blog_id}/posts/", body)))
+        else:
+            with metrics.span("publish"):
+                res = client.post(f"{BLOGGER_API}/blogs/{blog_id}/posts/", body)
+            log(f"[created] {res.get('url')}")
+            metrics.incr("entries.posted")
+            ledger_record(ledger, link, res.get("id"), res.get("url"), h)
+            posted += 1
+
+    if calls:
+        posted += publish_batch(calls, client, ledger, cfg)
+    if ledger is not None:
+        ledger.close()
+    log(f"[done] posted={posted}, checked={len(to_publish)}")
+
+def publish_batch(calls, client, ledger, cfg):
+    """모아 둔 생성/수정 호출을 배치 요청으로. 성공분은 장부에 남기고, 끝내 실패한 파트가 있으면 첫 오류를 올린다."""
+    from .publisher import batch_all
+    from .publish_ledger import ledger_record
+
+    def done(c, res):
+        title, link, h, row, _ = c
+        ledger_record(ledger, link, res.get("id"), res.get("url"), h)
+        if row:
+            log(f"[updated] {res.get('url') or row['url']}")
+            metrics.incr("entries.updated")
+            return 0
+        log(f"[created] {res.get('url')}")
+        metrics.incr("entries.posted")
+        return 1
+
+    results = batch_all(calls, lambda c: c[4], done, client, BATCH_API, size=cfg["batch"], log=log)
+    errors = [err for _, _, err in results if err is not None]
+    if errors:
+        raise errors[0]
+    return sum(r for _, r, _ in results)
+
+def run(args):
+    main(args)
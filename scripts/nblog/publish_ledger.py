@@ -0,0 +1,75 @@
+import os, sqlite3, hashlib, pathlib, threading
+from datetime import datetime, timezone
+from .common import link_keys
+
+# 발행 장부(ledger): 이미 올린 글을 로컬 SQLite에 기록해 두고
+# 중복 체크를 posts/search 호출 없이 O(1) 조회로 끝낸다.
+#
+# 키: 네이버 글ID(source marker의 post_id) + 정규화 링크(query/fragment 제거)
+# content_hash: 마지막으로 올린 제목+요약의 해시 → 원문이 수정됐는지 API 호출 없이 판단
+
+LEDGER_PATH = os.environ.get("PUBLISH_LEDGER", ".cache/publish_ledger.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posted (
+    post_id    TEXT PRIMARY KEY,
+    link       TEXT NOT NULL,
+    blogger_id TEXT,
+    url        TEXT,
+    posted_at  TEXT NOT NULL,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS posted_link ON posted(link);
+"""
+
+# 동시 발행 워커들이 한 연결을 공유하므로 조회/기록은 락으로 직렬화
+_lock = threading.Lock()
+
+def content_hash(title, summary):
+    return hashlib.sha256(f"{title}\x00{summary}".encode("utf-8")).hexdigest()[:20]
+
+def open_ledger(path=None):
+    """장부 열기. path가 None이면 LEDGER_PATH, 빈 문자열이면 None(장부 사용 안 함)."""
+    path = LEDGER_PATH if path is None else path
+    if not path:
+        return None
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.executescript(_SCHEMA)
+    # 예전 장부에는 content_hash 컬럼이 없다 → 추가만 (기존 행은 NULL)
+    cols = {row[1] for row in db.execute("PRAGMA table_info(posted)")}
+    if "content_hash" not in cols:
+        db.execute("ALTER TABLE posted ADD COLUMN content_hash TEXT")
+        db.commit()
+    return db
+
+def ledger_lookup(db, link):
+    """장부에 있으면 {post_id, link, blogger_id, url, content_hash} dict, 없으면 None."""
+    if db is None or not link:
+        return None
+    post_id, base = link_keys(link)
+    with _lock:
+        row = db.execute(
+            "SELECT post_id, link, blogger_id, url, content_hash FROM posted WHERE post_id = ? OR link = ? LIMIT 1",
+            (post_id, base),
+        ).fetchone()
+    if not row:
+        return None
+    return dict(zip(("post_id", "link", "blogger_id", "url", "content_hash"), row))
+
+def ledger_record(db, link, blogger_id=None, url=None, content_hash=None):
+    """발행/수정 성공(또는 원격에서 이미 존재 확인) 시 기록. 바로 commit 한다."""
+    if db is None or not link:
+        return
+    post_id, base = link_keys(link)
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    with _lock:
+        db.execute(
+            "INSERT INTO posted (post_id, link, blogger_id, url, posted_at, content_hash) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(post_id) DO UPDATE SET link = excluded.link, "
+            "blogger_id = COALESCE(excluded.blogger_id, posted.blogger_id), "
+            "url = COALESCE(excluded.url, posted.url), "
+            "content_hash = COALESCE(excluded.content_hash, posted.content_hash)",
+            (post_id, base, blogger_id, url, now, content_hash),
+        )
+        db.commit()
@@ -0,0 +1,209 @@
+import random, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from . import metrics
+
+# 동시 발행 엔진
+#
+# - 토큰 버킷으로 초당 쓰기 호출 수 제한 (예전 고정 sleep 2초 = 0.5/s). 버킷은 client.limiter로 걸려
+#   insert/patch 호출(배치면 쓰기 파트 수만큼)마다 토큰을 쓴다. 검색/조회는 제한하지 않는다
+#   → 장부/스냅샷/해시로 API 없이 끝나는 항목, 중복 확인 검색은 기다리지 않는다
+#   → burst는 워커 수만큼: 평균 속도는 rate 그대로, 워커들이 처음부터 동시에 한 건씩 보낼 수 있다
+# - 429/5xx/네트워크 오류는 Retry-After 우선, 없으면 지수 백오프 + 지터로 재시도
+#   · 단 POST(posts.insert, 배치 안의 insert 파트)는 429만 다시 보낸다. 타임아웃/5xx면 서버에서 이미
+#     만들어졌을 수 있어서 다시 보내면 같은 글이 두 번 올라간다 → 실패로 남기고 다음 실행의 중복 확인에 맡김
+# - 429를 받으면 동시 실행 수를 절반으로 줄이고, 연속 성공 시 1씩 복구 (AIMD)
+# - 순서가 중요하면(ordered) 워커 1개로 입력 순서대로 발행
+# - batch_all: N개씩 multipart 배치 한 요청으로 보내고, 429/5xx 난 파트만 모아 다음 라운드에 다시
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = rate            # 초당 토큰 수 (0 이하면 제한 없음)
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.stamp = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self, n=1):
+        """토큰 n개 (burst보다 많아도 하나씩 받으므로 rate 속도로 채워진다)."""
+        if self.rate <= 0:
+            return
+        for _ in range(n):
+            self._take()
+
+    def _take(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.paused_until:
+                    self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+                    self.stamp = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.paused_until - now
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Retry-After 같은 서버 지시를 모든 워커에 공유."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+class AdaptiveLimit:
+    def __init__(self, maximum, recover_after=5):
+        self.maximum = max(1, maximum)
+        self.limit = self.maximum
+        self.active = 0
+        self.streak = 0
+        self.recover_after = recover_after
+        self.cond = threading.Condition()
+
+    def __enter__(self):
+        with self.cond:
+            while self.active >= self.limit:
+                self.cond.wait()
+            self.active += 1
+
+    def __exit__(self, *exc):
+        with self.cond:
+            self.active -= 1
+            self.cond.notify_all()
+
+    def throttled(self):
+        with self.cond:
+            self.limit = max(1, self.limit // 2)
+            self.streak = 0
+
+    def succeeded(self):
+        with self.cond:
+            self.streak += 1
+            if self.streak >= self.recover_after and self.limit < self.maximum:
+                self.limit += 1
+                self.streak = 0
+                self.cond.notify_all()
+
+def http_status(exc):
+    resp = getattr(exc, "response", None)
+    return getattr(resp, "status_code", None)
+
+def retry_after(exc):
+    """Retry-After 헤더(초 또는 HTTP-date) → 초. 없으면 None."""
+    resp = getattr(exc, "response", None)
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def request_method(exc):
+    """예외를 낸 요청의 HTTP 메서드 (requests 예외/HTTPError는 .request를 들고 있다)."""
+    return getattr(getattr(exc, "request", None), "method", None)
+
+def is_retryable(exc, method=None):
+    """method를 주면 그 호출 기준 (배치 파트), 없으면 예외의 요청 메서드로 판단."""
+    status = http_status(exc)
+    if (method or request_method(exc)) == "POST" and status != 429:
+        return False
+    if status is not None:
+        return status in RETRY_STATUS
+    # 응답 없는 연결/타임아웃 오류 (requests 예외도 OSError 계열)
+    return isinstance(exc, OSError)
+
+def publish_all(items, fn, workers=4, limiter=None, max_retries=5, ordered=False,
+                backoff_base=1.0, backoff_cap=60.0, log=print):
+    """
+    items 각각에 fn(item)을 실행하고 입력 순서대로 [(item, result, error)]를 돌려준다.
+    재시도를 다 써도 실패한 항목은 error에 예외가 담기고 나머지는 계속 진행한다.
+    limiter: fn이 쓰는 client.limiter (TokenBucket). 여기서는 429 Retry-After를 모든 워커에 알리는 데만 쓴다.
+    """
+    bucket = limiter or TokenBucket(0)
+    limit = AdaptiveLimit(1 if ordered else workers)
+
+    def run(item):
+        for attempt in range(max_retries + 1):
+            with limit:
+                try:
+                    result = fn(item)
+                except Exception as exc:
+                    if attempt >= max_retries or not is_retryable(exc):
+                        return item, None, exc
+                    status = http_status(exc)
+                    wait = retry_after(exc)
+                    if wait is None:
+                        wait = random.uniform(0, min(backoff_cap, backoff_base * 2 ** attempt))
+                    metrics.incr("retries")
+                    metrics.incr(f"retries.{status or type(exc).__name__}")
+                    if status == 429:
+                        limit.throttled()
+                        bucket.pause(wait)
+                    log(f"[retry] {status or type(exc).__name__} attempt={attempt + 1} wait={wait:.1f}s")
+                else:
+                    limit.succeeded()
+                    return item, result, None
+            time.sleep(wait)
+
+    if ordered or workers <= 1:
+        return [run(it) for it in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, items))
+
+def batch_all(items, call, done, client, batch_url, size=50, max_retries=5,
+              backoff_base=1.0, backoff_cap=60.0, log=print):
+    """
+    배치 모드 publish_all. call(item) → (method, url, json) 을 size개씩 client.batch 한 번으로 보내고
+    2xx 파트는 done(item, 응답 json)의 결과, 429/5xx 파트(배치 자체가 실패하면 그 묶음 전체)만 다음 라운드에 다시 보낸다.
+    insert(POST) 파트는 429일 때만 다시. 속도 제한은 client.limiter (쓰기 파트 하나가 호출 하나). 입력 순서대로 [(item, result, error)].
+    """
+    bucket = getattr(client, "limiter", None) or TokenBucket(0)
+    out = [None] * len(items)
+    pending = list(range(len(items)))
+    for attempt in range(max_retries + 1):
+        last = attempt >= max_retries
+        retry, waits, throttled = [], [], False
+        for k in range(0, len(pending), max(1, size)):
+            group = pending[k:k + max(1, size)]
+            calls = [call(items[i]) for i in group]
+            try:
+                with metrics.span("publish.batch"):
+                    parts = client.batch(calls, batch_url)
+            except Exception as exc:
+                # 배치 자체가 실패: 파트마다 자기 메서드로 재시도 여부를 판단 (검색 GET은 다시, insert는 429만)
+                parts = [getattr(exc, "response", None)] * len(group) if http_status(exc) else [exc] * len(group)
+            metrics.incr("batch.requests")
+            for i, (method, _, _), part in zip(group, calls, parts):
+                try:
+                    if isinstance(part, Exception):
+                        raise part
+                    part.raise_for_status()
+                    out[i] = (items[i], done(items[i], part.json()), None)
+                except Exception as exc:
+                    if last or not is_retryable(exc, method):
+                        out[i] = (items[i], None, exc)
+                        continue
+                    retry.append(i)
+                    throttled |= http_status(exc) == 429
+                    w = retry_after(exc)
+                    if w is not None:
+                        waits.append(w)
+        if not retry:
+            break
+        wait = max(waits) if waits else random.uniform(0, min(backoff_cap, backoff_base * 2 ** attempt))
+        metrics.incr("retries", len(retry))
+        log(f"[retry] {len(retry)} batch parts attempt={attempt + 1} wait={wait:.1f}s")
+        if throttled:
+            bucket.pause(wait)
+        time.sleep(wait)
+        pending = retry
+    return out
@@ -0,0 +1,161 @@
+import os, re, json, hashlib, pathlib, unicodedata
+from .html_text import html_to_text
+
+# 정적 사이트용 검색 색인 (build 전용)
+#
+# dist/search/t-{k}.json : {bigram: [글 id 차분 목록]}  (k = bigram 코드포인트 합 % SEARCH_SHARDS)
+# dist/search/d-{b}.json : {글 id: [제목, 주소, 날짜]}     (b = id // DOC_BLOCK)
+#
+# - 토큰: NFKC + 소문자로 정규화한 단어의 글자 bigram (한 글자 단어는 그 글자)
+#   → 형태소 분석 없이도 한국어 부분 일치가 된다. search.html이 같은 규칙으로 질의를 쪼개
+#     필요한 t-*.json 만 받아 교집합을 낸다.
+# - 증분: .cache/search_state.json 에 글별 (내용 해시, 닿은 shard 비트마스크)를 두고
+#   바뀐 글만 다시 토큰화한다. 이전 빌드의 shard 파일은 건드릴 shard만 읽어서 고친다.
+
+SEARCH_SHARDS = int(os.environ.get("SEARCH_SHARDS", "64"))
+SEARCH_STATE = pathlib.Path(os.environ.get("SEARCH_STATE", ".cache/search_state.json"))
+DOC_BLOCK = 1000
+
+WORD_RE = re.compile(r"[^\W_]+")
+
+def grams(text):
+    out = set()
+    for w in WORD_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if len(w) == 1:
+            out.add(w)
+        else:
+            out.update(w[i:i + 2] for i in range(len(w) - 1))
+    return out
+
+def shard_of(gram, shards=SEARCH_SHARDS):
+    return sum(map(ord, gram)) % shards
+
+def _bits(mask):
+    k = 0
+    while mask:
+        if mask & 1:
+            yield k
+        mask >>= 1
+        k += 1
+
+def _encode(ids):
+    # 정렬 후 차분 → 숫자가 작아져 JSON이 짧다
+    out, prev = [], 0
+    for i in sorted(ids):
+        out.append(i - prev)
+        prev = i
+    return out
+
+def _decode(deltas):
+    ids, cur = set(), 0
+    for d in deltas:
+        cur += d
+        ids.add(cur)
+    return ids
+
+class SearchIndex:
+    def __init__(self, out_dir, state_path=SEARCH_STATE, shards=SEARCH_SHARDS, text_limit=1000):
+        self.dir = pathlib.Path(out_dir)
+        self.text_limit = text_limit
+        self.state_path = pathlib.Path(state_path)
+        self.shards = shards
+        self.docs = {}        # id → [해시, shard 마스크]
+        self.terms = {}       # shard → {bigram: set(id)} (건드린 shard만 로드)
+        self.blocks = {}      # block → {id: meta}
+        self.dirty_terms, self.dirty_blocks = set(), set()
+        self.seen = set()
+        self.fresh = True
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        # shard 수가 바뀌었거나 이전 산출물이 없으면 처음부터
+        if state.get("shards") != shards or not all((self.dir / f).exists() for f in state.get("files", [])):
+            return
+        self.docs = {int(k): v for k, v in state["docs"].items()}
+        self.fresh = False
+
+    def _rel(self, name):
+        return f"{self.dir.name}/{name}"
+
+    def _terms(self, k):
+        if k not in self.terms:
+            path = self.dir / f"t-{k}.json"
+            raw = {} if self.fresh or not path.exists() else json.loads(path.read_text(encoding="utf-8"))
+            self.terms[k] = {g: _decode(d) for g, d in raw.items()}
+        return self.terms[k]
+
+    def _block(self, b):
+        if b not in self.blocks:
+            path = self.dir / f"d-{b}.json"
+            raw = {} if self.fresh or not path.exists() else json.loads(path.read_text(encoding="utf-8"))
+            self.blocks[b] = {int(k): v for k, v in raw.items()}
+        return self.blocks[b]
+
+    def _remove(self, doc_id, mask):
+        for k in _bits(mask):
+            t = self._terms(k)
+            for g in [g for g, ids in t.items() if doc_id in ids]:
+                t[g].discard(doc_id)
+                if not t[g]:
+                    del t[g]
+            self.dirty_terms.add(k)
+        b = doc_id // DOC_BLOCK
+        self._block(b).pop(doc_id, None)
+        self.dirty_blocks.add(b)
+
+    def update(self, doc_id, title, summary, meta):
+        """글 하나 반영. 원문(제목+요약 HTML+meta)이 그대로면 토큰화 없이 False."""
+        self.seen.add(doc_id)
+        h = hashlib.sha256(json.dumps([title, summary, meta], ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+        old = self.docs.get(doc_id)
+        if old and old[0] == h:
+            return False
+        if old:
+            self._remove(doc_id, old[1])
+        mask = 0
+        for g in grams(f"{title} {html_to_text(summary, self.text_limit)}"):
+            k = shard_of(g, self.shards)
+            self._terms(k).setdefault(g, set()).add(doc_id)
+            mask |= 1 << k
+            self.dirty_terms.add(k)
+        b = doc_id // DOC_BLOCK
+        self._block(b)[doc_id] = meta
+        self.dirty_blocks.add(b)
+        self.docs[doc_id] = [h, mask]
+        return True
+
+    def prune(self):
+        """이번 빌드에서 update 되지 않은 글을 색인에서 뺀다. 뺀 개수."""
+        gone = [i for i in self.docs if i not in self.seen]
+        for i in gone:
+            self._remove(i, self.docs.pop(i)[1])
+        return len(gone)
+
+    def files(self):
+        """(rel, text 또는 None). None은 내용이 그대로인 파일 → 다시 쓸 필요 없음."""
+        for k in range(self.shards):
+            text = None
+            if k in self.dirty_terms or self.fresh:
+                t = self._terms(k)
+                text = json.dumps({g: _encode(ids) for g, ids in sorted(t.items())}, ensure_ascii=False, separators=(",", ":"))
+            yield self._rel(f"t-{k}.json"), text
+        for b in sorted({i // DOC_BLOCK for i in self.docs} | self.dirty_blocks):
+            text = None
+            if b in self.dirty_blocks:
+                blk = self._block(b)
+                if not blk:
+                    continue  # 빈 블록은 만들지 않음 (이전 파일은 빌드 정리 단계에서 지워진다)
+                text = json.dumps({str(i): blk[i] for i in sorted(blk)}, ensure_ascii=False, separators=(",", ":"))
+            yield self._rel(f"d-{b}.json"), text
+
+    def save(self, files):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps({
+            "shards": self.shards,
+            "files": [pathlib.Path(f).name for f in files],
+            "docs": {str(i): v for i, v in self.docs.items()},
+        }, separators=(",", ":")), encoding="utf-8")
+
+    def stats(self):
+        return {"docs": len(self.docs), "shards_touched": len(self.dirty_terms), "blocks_touched": len(self.dirty_blocks)}
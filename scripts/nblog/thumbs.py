@@ -0,0 +1,184 @@
+import os, re, json, html, time, hashlib, pathlib, tempfile, threading, urllib.request, urllib.error
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+from . import metrics
+from .feed_cache import USER_AGENT
+
+# 썸네일 미러 (build 전용)
+#
+# - 글마다 첫 이미지(enclosure / media:thumbnail / 요약 HTML의 첫 <img>) 주소를 고른다
+# - 내용 해시 이름으로 .cache/thumbs/ 에 한 번만 저장 → 주소가 달라도 같은 그림은 파일 하나
+# - index.json 에 주소 → 파일, 파일 → (크기, 마지막 사용 시각). 캐시에 있는 주소는 다시 받지 않는다
+# - 전체 크기가 THUMB_CACHE_MB 를 넘으면 이번 빌드에서 안 쓴 파일부터 오래된 순으로 지운다 (LRU)
+# - 받기는 스레드 풀 + 호스트별 동시 연결 THUMB_PER_HOST 개. 네이버 핫링크 차단 때문에 Referer로 원문 주소를 보낸다
+# - 실패한 주소는 THUMB_RETRY_S 동안 다시 시도하지 않는다
+
+THUMB_DIR = os.environ.get("THUMB_CACHE", ".cache/thumbs")
+THUMB_CACHE_MB = float(os.environ.get("THUMB_CACHE_MB", "256"))
+THUMB_MAX_BYTES = int(os.environ.get("THUMB_MAX_BYTES", str(5 * 1024 * 1024)))
+THUMB_WORKERS = int(os.environ.get("THUMB_WORKERS", "8"))
+THUMB_PER_HOST = int(os.environ.get("THUMB_PER_HOST", "2"))
+THUMB_TIMEOUT = float(os.environ.get("THUMB_TIMEOUT", "20"))
+THUMB_RETRY_S = int(os.environ.get("THUMB_RETRY_S", str(24 * 3600)))
+
+TYPES = {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp", "image/avif": ".avif"}
+IMG_RE = re.compile(r"""<img\b[^>]*?\bsrc\s*=\s*["']([^"']+)["']""", re.I)
+
+def _abs(url):
+    url = html.unescape(url or "").strip()
+    if url.startswith("//"):
+        url = "https:" + url
+    return url if url.startswith(("http://", "https://")) else None
+
+def image_url(e):
+    """피드 항목의 대표 이미지 주소 (없으면 None)."""
+    for enc in e.get("enclosures") or []:
+        if (enc.get("type") or "").startswith("image/") and _abs(enc.get("href")):
+            return _abs(enc.get("href"))
+    for m in e.get("media_thumbnail") or []:
+        if _abs(m.get("url")):
+            return _abs(m.get("url"))
+    for m in e.get("media_content") or []:
+        if (m.get("medium") == "image" or (m.get("type") or "").startswith("image/")) and _abs(m.get("url")):
+            return _abs(m.get("url"))
+    m = IMG_RE.search(e.get("summary") or e.get("description") or "")
+    return _abs(m.group(1)) if m else None
+
+class ThumbCache:
+    def __init__(self, cache_dir=THUMB_DIR, max_bytes=THUMB_CACHE_MB * 1024 * 1024):
+        self.dir = pathlib.Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.dir / "index.json"
+        self.max_bytes = max_bytes
+        try:
+            idx = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            idx = {}
+        self.urls = idx.get("urls", {})      # 주소 → 파일 이름
+        self.files = idx.get("files", {})    # 파일 이름 → [크기, 마지막 사용 시각]
+        self.failed = idx.get("failed", {})  # 주소 → 실패 시각
+        self.used = set()
+        self.stats = {"hit": 0, "fetched": 0, "failed": 0, "skipped": 0, "evicted": 0}
+
+    def path(self, name):
+        return self.dir / name
+
+    def _touch(self, name, size=None):
+        now = int(time.time())
+        if size is None:
+            size = self.files.get(name, [0])[0]
+        self.files[name] = [size, now]
+        self.used.add(name)
+
+    def fetch(self, items):
+        """[(이미지 주소, Referer)] → {주소: 파일 이름}. 캐시에 있으면 그대로, 없는 것만 동시에 받는다."""
+        out, todo, now = {}, {}, time.time()
+        for url, referer in items:
+            if url in out or url in todo:
+                continue
+            name = self.urls.get(url)
+            if name and self.path(name).exists():
+                self._touch(name)
+                out[url] = name
+                self.stats["hit"] += 1
+            elif now - self.failed.get(url, 0) < THUMB_RETRY_S:
+                self.stats["skipped"] += 1
+            else:
+                todo[url] = referer
+        if not todo:
+            return out
+
+        # 호스트별 세마포어: 한 호스트(pstatic 등)에 동시에 THUMB_PER_HOST 개까지만
+        limits = defaultdict(lambda: threading.BoundedSemaphore(THUMB_PER_HOST))
+        for url in todo:
+            limits[urlsplit(url).netloc]
+        with ThreadPoolExecutor(max_workers=max(1, THUMB_WORKERS)) as pool:
+            futs = {pool.submit(self._download, url, ref, limits[urlsplit(url).netloc]): url for url, ref in todo.items()}
+            # 색인은 여기(호출 스레드)에서만 고친다
+            for fut in as_completed(futs):
+                url = futs[fut]
+                try:
+                    name, size = fut.result()
+                except Exception as exc:
+                    metrics.log(f"[warn] thumbnail failed: {url}: {exc}")
+                    self.failed[url] = int(now)
+                    self.stats["failed"] += 1
+                    continue
+                self.failed.pop(url, None)
+                self.urls[url] = name
+                self._touch(name, size)
+                out[url] = name
+                self.stats["fetched"] += 1
+        return out
+
+    def _download(self, url, referer, limit):
+        headers = {"User-Agent": USER_AGENT, "Accept": "image/*"}
+        if referer:
+            headers["Referer"] = referer
+        with limit, metrics.span("thumbs.download"):
+            try:
+                resp = urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=THUMB_TIMEOUT)
+            except urllib.error.HTTPError as e:
+                metrics.http("thumb", e.code)
+                raise
+            with resp:
+                ctype = (resp.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+                if ctype not in TYPES:
+                    metrics.http("thumb", resp.status)
+                    raise ValueError(f"not an image: {ctype or '?'}")
+                h, size = hashlib.sha256(), 0
+                fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".part")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        while True:
+                            chunk = resp.read(64 * 1024)
+                            if not chunk:
+                                break
+                            size += len(chunk)
+                            if size > THUMB_MAX_BYTES:
+                                raise ValueError(f"image larger than {THUMB_MAX_BYTES} bytes")
+                            h.update(chunk)
+                            f.write(chunk)
+                    name = h.hexdigest()[:32] + TYPES[ctype]
+                    # 같은 그림이 이미 있으면 새로 받은 건 버린다
+                    if self.path(name).exists():
+                        os.unlink(tmp)
+                    else:
+                        os.replace(tmp, self.path(name))
+                except BaseException:
+                    pathlib.Path(tmp).unlink(missing_ok=True)
+                    raise
+        metrics.http("thumb", resp.status, size)
+        return name, size
+
+    def evict(self):
+        """크기 상한을 넘으면 이번에 안 쓴 파일을 마지막 사용이 오래된 순으로 지운다."""
+        total = sum(size for size, _ in self.files.values())
+        gone = set()
+        for name, (size, _) in sorted(self.files.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_bytes:
+                break
+            if name in self.used:
+                continue
+            self.path(name).unlink(missing_ok=True)
+            gone.add(name)
+            total -= size
+        for name in gone:
+            del self.files[name]
+        if gone:
+            self.urls = {u: n for u, n in self.urls.items() if n not in gone}
+        self.stats["evicted"] += len(gone)
+        self.stats["bytes"] = total
+
+    def save(self):
+        self.evict()
+        # 오래된 실패 기록은 버림 (색인이 계속 커지지 않게)
+        now = time.time()
+        self.failed = {u: t for u, t in self.failed.items() if now - t < THUMB_RETRY_S}
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"urls": self.urls, "files": self.files, "failed": self.failed},
+                                  separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+        for k in ("hit", "fetched", "failed", "evicted"):
+            metrics.incr(f"thumbs.{k}", self.stats[k])
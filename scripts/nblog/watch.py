@@ -0,0 +1,157 @@
+import gc, time, random, signal, threading
+from collections import deque
+from . import feed_cache, metrics
+from .common import rss_urls
+from .metrics import log
+
+# 상주 감시 모드: 피드를 주기적으로 확인하다가 바뀌었을 때만 build / post
+#
+#   python -m nblog watch                       # build + post, 60초~30분 간격
+#   python -m nblog watch --no-post             # 미러 사이트만
+#   python -m nblog watch --min-interval 30 --max-interval 600
+#
+# - 프로세스 하나가 Blogger 세션/토큰과 피드 캐시(ETag)를 계속 들고 있어 매번 cold start 하지 않는다
+# - 간격은 피드의 실제 발행 간격(최근 KEEP개 글의 간격 중앙값)에서 정한다
+#   · 새 글이 보이면 바로 min-interval로 좁히고, 조용하면 BACKOFF배씩 상한까지 늘린다
+#   · 상한 = 중앙값 간격 / DIVISOR. 마지막 글 이후로 평소보다 오래 조용하면 상한도 같이 늘어난다
+# - 한 사이클에서 받은 피드/항목은 사이클이 끝나면 버린다 (들고 있는 건 최근 발행 시각 KEEP개뿐)
+
+KEEP = 20
+DIVISOR = 24      # 하루 한 편이면 1시간, 두 시간에 한 편이면 5분 간격
+BACKOFF = 1.5
+JITTER = 0.1
+
+class Cadence:
+    """최근 발행 시각으로 다음 폴링 간격(초)을 정한다."""
+
+    def __init__(self, lo, hi, keep=KEEP):
+        self.lo, self.hi = lo, max(lo, hi)
+        self.stamps = deque(maxlen=keep)
+        self.interval = lo
+
+    def learn(self, stamps):
+        now = time.time()
+        merged = sorted(set(self.stamps) | {t for t in stamps if 0 < t <= now})
+        self.stamps.clear()
+        self.stamps.extend(merged[-self.stamps.maxlen:])
+
+    def ceiling(self, now):
+        s = list(self.stamps)
+        gaps = sorted(b - a for a, b in zip(s, s[1:]) if b > a)
+        if not gaps:
+            return self.hi
+        gap = max(gaps[len(gaps) // 2], (now - s[-1]) / 2)
+        return min(self.hi, max(self.lo, gap / DIVISOR))
+
+    def next(self, changed, now=None):
+        if changed:
+            self.interval = self.lo
+        else:
+            self.interval = min(self.ceiling(now or time.time()), self.interval * BACKOFF)
+        return self.interval
+
+    def failed(self):
+        # 네트워크/API 오류: 상한 안에서 두 배씩
+        self.interval = min(self.hi, self.interval * 2)
+        return self.interval
+
+class Watcher:
+    def __init__(self, args):
+        from . import build
+        self.build = build
+        self.urls = rss_urls()
+        self.do_build, self.do_post = not args.no_build, not args.no_post
+        self.cadence = Cadence(args.min_interval, args.max_interval)
+        self.stat = {}          # 로컬 파일 피드: url → (mtime_ns, size)
+        self.client = None
+        self.blog_id = None
+        if self.do_post:
+            from .common import require_env
+            self.blog_id = require_env()
+
+    def seed(self):
+        """캐시에 남은 마지막 본문으로 발행 간격을 미리 익힌다 (첫 폴링이 304여도 간격이 맞게)."""
+        for url in self.urls:
+            path = feed_cache.cached_copy(url)
+            if path:
+                self.learn(self.build.parse_feed(url, path.read_bytes()))
+
+    def learn(self, entries):
+        self.cadence.learn(self.build.entry_ts(e) for e in entries)
+
+    def poll(self):
+        """watch가 아직 처리하지 않은 피드만 [(url, False, body, digest)]."""
+        changed = []
+        for url in self.urls:
+            with metrics.span("watch.poll"):
+                res = feed_cache.fetch_feed(url, consumer="watch")
+            if res.not_modified:
+                continue
+            if not url.startswith(("http://", "https://")):
+                st = res.path.stat()
+                sig = (st.st_mtime_ns, st.st_size)
+                if self.stat.get(url) == sig:
+                    continue
+                self.stat[url] = sig
+            changed.append((url, False, res.path.read_bytes(), res.digest))
+        return changed
+
+    def publish(self, entries):
+        from . import post
+        from .common import get_client
+        if self.client is None:
+            # 한 번 만든 클라이언트(세션 + 토큰)를 끝까지 재사용. 토큰은 만료 직전에만 다시 받는다
+            self.client = get_client(eager=False)
+        with metrics.span("watch.post"):
+            post.publish(entries, self.client, self.blog_id, post.settings())
+
+    def cycle(self):
+        """한 번 확인. 바뀐 게 있었으면 True."""
+        changed = self.poll()
+        if not changed:
+            return False
+        metrics.incr("watch.changes")
+        log(f"[watch] changed: {', '.join(u for u, _, _, _ in changed)}")
+        try:
+            feeds = [self.build.parse_feed(u, body) for u, _, body, _ in changed]
+            for entries in feeds:
+                self.learn(entries)
+            if self.do_build:
+                with metrics.span("watch.build"):
+                    self.build.build([c[:3] for c in changed], consumer=None)
+            if self.do_post:
+                self.publish(self.build.merge_entries(feeds, None))
+        except BaseException:
+            # 처리 완료를 남기지 않았으니 다음 폴링에서 다시 바뀐 것으로 잡혀 재시도된다
+            for u, _, _, _ in changed:
+                self.stat.pop(u, None)
+            raise
+        for u, _, _, d in changed:
+            feed_cache.mark_handled(u, "watch", d)
+        return True
+
+def run(args):
+    w = Watcher(args)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    w.seed()
+    n = 0
+    try:
+        while not stop.is_set():
+            n += 1
+            metrics.incr("watch.polls")
+            try:
+                wait = w.cadence.next(w.cycle())
+            except Exception as e:
+                metrics.incr("watch.errors")
+                log(f"[warn] watch cycle failed: {e}")
+                wait = w.cadence.failed()
+            gc.collect()
+            if args.cycles and n >= args.cycles:
+                break
+            wait *= random.uniform(1 - JITTER, 1 + JITTER)
+            log(f"[watch] cycle={n} next={wait:.0f}s")
+            stop.wait(wait)
+    except KeyboardInterrupt:
+        pass
+    log(f"[watch] stopped after {n} cycles")
@@ -0,0 +1,53 @@
+import random
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from html import escape
+
+# 벤치마크용 합성 네이버 RSS
+#
+# - 한글 제목 (일부는 일부러 같은 제목 → slug 충돌)
+# - 링크 모양 두 가지: /{blogId}/{logNo}?fromRss=... 와 PostView.nhn?blogId=..&logNo=..
+# - CDATA 안에 HTML 요약 (길이 제각각)
+# - 최신순 정렬
+
+BLOG_ID = "do_run_"
+WORDS = ["러닝", "마라톤", "회복", "훈련", "일지", "인터벌", "장거리", "템포런", "부상", "스트레칭",
+         "러닝화", "후기", "기록", "페이스", "하프", "풀코스", "트레일", "새벽", "한강", "대회"]
+
+def _title(rng, i):
+    # 열에 하나는 흔한 제목으로 겹치게 만든다
+    if i % 10 == 0:
+        return "오늘의 러닝 일지"
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))) + f" #{i}"
+
+def _link(i):
+    log_no = 223000000000 + i
+    if i % 3 == 0:
+        return f"https://blog.naver.com/PostView.nhn?blogId={BLOG_ID}&logNo={log_no}"
+    return f"https://blog.naver.com/{BLOG_ID}/{log_no}?fromRss=true&trackingCode=rss"
+
+def _summary(rng, words=(20, 80)):
+    body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(*words)))
+    return f'<p>{body}</p><p><img src="https://blogthumb.pstatic.net/{rng.randint(1, 10**9)}.jpg" /></p>'
+
+def summaries(n, seed=0, words=(20, 80)):
+    """요약 HTML n개 (요약기 벤치마크용)."""
+    rng = random.Random(seed)
+    return [_summary(rng, words) for _ in range(n)]
+
+def write_feed(path, n, seed=0, summary_words=(20, 80)):
+    """글 n개짜리 피드를 path에 쓴다 (스트리밍으로 써서 50k도 메모리 부담 없음)."""
+    rng = random.Random(seed)
+    start = datetime(2015, 1, 1, tzinfo=timezone.utc)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+                f'<title>{BLOG_ID}님의 블로그</title><link>https://blog.naver.com/{BLOG_ID}</link>\n')
+        for i in range(n, 0, -1):
+            d = start + timedelta(hours=i * 7)
+            f.write(
+                f"<item><title>{escape(_title(rng, i))}</title>"
+                f"<link>{escape(_link(i))}</link>"
+                f"<description><![CDATA[{_summary(rng, summary_words)}]]></description>"
+                f"<pubDate>{format_datetime(d)}</pubDate></item>\n"
+            )
+        f.write("</channel></rss>\n")